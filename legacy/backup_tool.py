@@ -1,77 +1,170 @@
-from time import strftime, localtime
+from time import localtime
+import errno
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+PARALLEL_MIN_FILES = 8
+COPY_CHUNK_SIZE = 1 << 30
+
+def iter_files_only(dir: str) -> Iterator[str]:
+    with os.scandir(dir) as entries:
+        for entry in entries:
+            if entry.is_file():
+                yield entry.name
+
+def iter_dirs_only(dir: str) -> Iterator[str]:
+    with os.scandir(dir) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                yield entry.name
 
 def get_files_only(dir: str) -> list:
-    files = []
-    for entry in os.listdir(dir):
-        if os.path.isfile(os.path.join(dir, entry)):
-            files.append(entry)
-    return files
+    return list(iter_files_only(dir))
 
 def get_dirs_only(dir: str) -> list:
-    directories = []
-    for entry in os.listdir(dir):
-        if os.path.isdir(os.path.join(dir, entry)):
-            directories.append(entry)
-    return directories
+    return list(iter_dirs_only(dir))
 
-def move_files_only(dir_from: str,
-                    dir_to: str,
-                    files_target: list[str] = None) -> int:
-    count = 0
+def _move_file(path_from: str, path_to: str) -> None:
+    
+    # Rename in place if same filesystem, otherwise fall back to copy and delete
+    try:
+        os.replace(path_from, path_to)
+    except OSError:
+        shutil.move(path_from, path_to)
+
+def _fast_copy(path_from: str, path_to: str) -> None:
+    
+    # Without copy_file_range, shutil already uses sendfile where available
+    if not hasattr(os, 'copy_file_range'):
+        shutil.copy(path_from, path_to)
+        return
+    
+    # Copy in kernel space to EOF (file may grow meanwhile), which allows reflink on CoW filesystems
+    try:
+        with open(path_from, 'rb') as file_from, open(path_to, 'wb') as file_to:
+            fd_from = file_from.fileno()
+            fd_to = file_to.fileno()
+            size = os.fstat(fd_from).st_size
+            remain = size
+            while True:
+                copied = os.copy_file_range(fd_from, fd_to, remain if remain > 0 else COPY_CHUNK_SIZE)
+                if copied == 0:
+                    break
+                remain -= copied
+        
+        # If ended short of size (file shrank) or size unknown (e.g. procfs), copy with shutil
+        if remain > 0 or size == 0:
+            shutil.copyfile(path_from, path_to)
+    
+    # If not supported across these filesystems, fall back to shutil
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+            raise
+        shutil.copyfile(path_from, path_to)
+    shutil.copymode(path_from, path_to)
+
+def _list_file_pairs(dir_from: str,
+                     dir_to: str,
+                     files_target: list[str] = None) -> list[tuple[str, str]]:
+    
+    # Join once, then concatenate per file
+    prefix_from = os.path.join(dir_from, '')
+    prefix_to = os.path.join(dir_to, '')
+    pairs = []
     if files_target is None:
-        files_target = os.listdir(dir_from)
+        with os.scandir(dir_from) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    pairs.append((entry.path, prefix_to + entry.name))
+        return pairs
     for file_name in files_target:
-        path_from = os.path.join(dir_from, file_name)
+        path_from = prefix_from + file_name
         if os.path.isfile(path_from):
-            path_to = os.path.join(dir_to, file_name)
-            shutil.move(path_from, path_to)
-            count += 1
-    return count
+            pairs.append((path_from, prefix_to + file_name))
+    return pairs
+
+def _transfer_files(func, pairs: list[tuple[str, str]]) -> int:
+    
+    # If few files, pool setup costs more than it saves
+    if len(pairs) < PARALLEL_MIN_FILES:
+        for path_from, path_to in pairs:
+            func(path_from, path_to)
+        return len(pairs)
+    
+    # Overlap I/O latency across files
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(func, path_from, path_to) for path_from, path_to in pairs]
+    for future in futures:
+        future.result()
+    return len(futures)
+
+def move_files_only(dir_from: str,
+                    dir_to: str,
+                    files_target: list[str] = None) -> int:
+    pairs = _list_file_pairs(dir_from, dir_to, files_target)
+    return _transfer_files(_move_file, pairs)
 
 def copy_files_only(dir_from: str,
                     dir_to: str,
                     files_target: list[str] = None) -> int:
-    count = 0
-    if files_target is None:
-        files_target = os.listdir(dir_from)
-    for file_name in files_target:
-        path_from = os.path.join(dir_from, file_name)
-        if os.path.isfile(path_from):
-            path_to = os.path.join(dir_to, file_name)
-            shutil.copy(path_from, path_to)
-            count += 1
-    return count
+    pairs = _list_file_pairs(dir_from, dir_to, files_target)
+    return _transfer_files(_fast_copy, pairs)
+
+def _remove_file(path_target: str) -> bool:
+    
+    # Let unlink reject directories instead of checking with a stat first
+    try:
+        os.unlink(path_target)
+        return True
+    except (IsADirectoryError, FileNotFoundError):
+        return False
+    except PermissionError:
+        if os.path.isdir(path_target):
+            return False
+        raise
+
+def _remove_if_file(path_target: str) -> bool:
+    
+    # Skip anything but regular files (or links to them), like listing does
+    if not os.path.isfile(path_target):
+        return False
+    return _remove_file(path_target)
 
 def remove_files_only(dir_target: str,
                       files_target: list[str] = None) -> int:
-    count = 0
     if files_target is None:
-        files_target = os.listdir(dir_target)
-    for file_name in files_target:
-        path_target = os.path.join(dir_target, file_name)
-        if os.path.isfile(path_target):
-            os.remove(path_target)
-            count += 1
-    return count
+        with os.scandir(dir_target) as entries:
+            paths = [entry.path for entry in entries if entry.is_file()]
+        remove = _remove_file
+    else:
+        prefix_target = os.path.join(dir_target, '')
+        paths = [prefix_target + file_name for file_name in files_target]
+        remove = _remove_if_file
+    
+    # If few files, pool setup costs more than it saves
+    if len(paths) < PARALLEL_MIN_FILES:
+        return sum(remove(path_target) for path_target in paths)
+    
+    # Overlap unlink latency (and stat of named files) across files
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return sum(executor.map(remove, paths))
 
 def backup_files(dir_target: str,
                  files_target: list[str] = None,
                  time_given: str = None,
                  remove_original: bool = True) -> int:
     
-    # If target files specified, list them
+    # If target files specified, move/copy checks each is file
     if files_target:
-        files_listed = []
-        for file in files_target:
-            file_path = os.path.join(dir_target, file)
-            if os.path.isfile(file_path):
-                files_listed.append(file)
+        files_listed = files_target
     
-    # If target files not specified, list all
+    # If target files not specified, move/copy scans the dir directly
     else:
-        files_listed = get_files_only(dir_target)
+        files_listed = None
     
     # If time given, use it
     if time_given:
@@ -79,7 +172,9 @@ def backup_files(dir_target: str,
     
     # If time not give, get current time
     else:
-        time_backup = strftime('%y%m%d_%H%M%S', localtime())
+        now = localtime()
+        time_backup = (f'{now.tm_year % 100:02d}{now.tm_mon:02d}{now.tm_mday:02d}_'
+                       f'{now.tm_hour:02d}{now.tm_min:02d}{now.tm_sec:02d}')
     
     # Create backup dir
     dir_backup = f'{dir_target}/.bak_{time_backup}'
@@ -1,11 +1,17 @@
+import shlex
 import subprocess
+from typing import Union
 
-def shell_command(command: str) -> subprocess.CompletedProcess:
+def shell_command(command: Union[str, list[str]], shell: bool = False) -> subprocess.CompletedProcess:
     try:
-        result = subprocess.run(command,
-                                shell=True,
+        if shell:
+            args = command if isinstance(command, str) else shlex.join(command)
+        else:
+            args = shlex.split(command) if isinstance(command, str) else command
+        result = subprocess.run(args,
+                                shell=shell,
                                 capture_output=True,
                                 text=True)
         return result
     except Exception as exc:
-        return exc
\ No newline at end of file
+        return exc
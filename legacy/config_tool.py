@@ -1,4 +1,5 @@
 from configparser import ConfigParser
+import os
 
 class ConfParser:
     """Configuration File Parser"""
@@ -7,10 +8,23 @@ class ConfParser:
         self.path = path
         self.encode = encode
         self.parser = ConfigParser()
+        self._stat_key = None
+
+    def _ensure_loaded(self) -> None:
+        """Re-parse file only if modified since last read"""
+        try:
+            stat = os.stat(self.path)
+            key = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            key = None
+        if key != self._stat_key:
+            self.parser = ConfigParser()
+            self.parser.read(self.path, encoding=self.encode)
+            self._stat_key = key
 
     def read_any(self, section: str=None, option: str=None) -> str:
         """Read any of section, option, value"""
-        self.parser.read(self.path, encoding=self.encode)
+        self._ensure_loaded()
         if section is None:
             return self.parser.sections()
         if section in self.parser and option is None:
@@ -22,7 +36,7 @@ class ConfParser:
     def read_as_dict(self, section: str=None) -> dict:
         """Read as dict"""
         configs = {}
-        self.parser.read(self.path, encoding=self.encode)
+        self._ensure_loaded()
         if section is None:
             for section in self.parser.sections():
                 configs[section] = {}
@@ -34,7 +48,15 @@ class ConfParser:
                 configs[option] = value
             return configs
         return None
-            
+
+    def read_as_dict_raw(self, section: str=None) -> dict:
+        """Read as dict of raw values (no interpolation)"""
+        self._ensure_loaded()
+        if section is None:
+            return {name: dict(self.parser.items(name, raw=True)) for name in self.parser.sections()}
+        if self.parser.has_section(section):
+            return dict(self.parser.items(section, raw=True))
+        return None
 
     def write_one(self, section: str, option: str, value: str) -> None:
         """Write one specified section, option, value"""
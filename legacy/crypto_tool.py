@@ -1,17 +1,43 @@
+from functools import lru_cache
+import os
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+AESGCM_NONCE_SIZE = 12
 
 def fernet_create_key() -> bytes:
     key = Fernet.generate_key()
     return key 
 
+@lru_cache(maxsize=32)
+def _fernet_suite(key: bytes) -> Fernet:
+    return Fernet(key)
+
 def fernet_encrypt(key: bytes, input: str, encoding: str='utf-8') -> str:
-    cipher_suite = Fernet(key)
+    cipher_suite = _fernet_suite(key)
     encrypted = cipher_suite.encrypt(input.encode())
     output = encrypted.decode(encoding)
     return output
 
 def fernet_decrypt(key: bytes, input: str, encoding: str='utf-8') -> str:
-    cipher_suite = Fernet(key)
+    cipher_suite = _fernet_suite(key)
     decrypted = cipher_suite.decrypt(input.encode())
     output = decrypted.decode(encoding)
-    return output
\ No newline at end of file
+    return output
+
+def aesgcm_create_key() -> bytes:
+    """Create 32 raw bytes key (not base64 encoded as Fernet key)"""
+    key = AESGCM.generate_key(bit_length=256)
+    return key
+
+def aesgcm_encrypt(key: bytes, data: bytes, aad: bytes=b'') -> bytes:
+    """Encrypt bulk data in single AEAD pass, return nonce + ciphertext"""
+    nonce = os.urandom(AESGCM_NONCE_SIZE)
+    encrypted = AESGCM(key).encrypt(nonce, data, aad)
+    return nonce + encrypted
+
+def aesgcm_decrypt(key: bytes, data: bytes, aad: bytes=b'') -> bytes:
+    """Decrypt nonce + ciphertext created by aesgcm_encrypt"""
+    nonce = data[:AESGCM_NONCE_SIZE]
+    decrypted = AESGCM(key).decrypt(nonce, data[AESGCM_NONCE_SIZE:], aad)
+    return decrypted
\ No newline at end of file
@@ -41,22 +41,39 @@ class Csv:
                   encoding=self.encoding,
                   newline=self.newline) as file:
             reader_o = csv.reader(file, delimiter=self.delimiter)
-            data_ll = [read_i for read_i in reader_o]
             if self.header:
-                return data_ll[1:]
-            else:
-                return data_ll
+                next(reader_o, None)
+            data_ll = list(reader_o)
+            return data_ll
+
+    def read_data_arrow(self):
+        """Read data as columnar pyarrow table"""
+        import pyarrow.csv as pv
+        read_options = pv.ReadOptions(encoding=self.encoding,
+                                      autogenerate_column_names=not self.header)
+        parse_options = pv.ParseOptions(delimiter=self.delimiter)
+        table = pv.read_csv(self.path,
+                            read_options=read_options,
+                            parse_options=parse_options)
+        return table
 
     def count_data(self):
         """Count data quantity"""
-        with open(file=self.path,
-                  mode='r',
-                  encoding=self.encoding,
-                  newline=self.newline) as file:
-            if self.header:
-                return len(file.readlines()) - 1
-            else:
-                return len(file.readlines())
+        count = 0
+        last = b''
+        with open(file=self.path, mode='rb') as file:
+            while True:
+                chunk = file.read(1 << 20)
+                if not chunk:
+                    break
+                count += chunk.count(b'\n')
+                last = chunk
+        if last and not last.endswith(b'\n'):
+            count += 1
+        if self.header:
+            return count - 1
+        else:
+            return count
 
     def write_one(self, data_l):
         """Write 1-dimension list"""
@@ -1,60 +1,91 @@
 from typing import Any, Union
 
-def find_value(data: Union[dict, list], target: Any, _paths: Union[None, list]=None):
+_NOT_MATRIX = object()
+
+def _container_type(value: Any) -> Union[type, None]:
+    """Return dict or list if value is such container, checking exact type first"""
+    
+    value_type = type(value)
+    if value_type is dict or value_type is list:
+        return value_type
+    if isinstance(value, dict):
+        return dict
+    if isinstance(value, list):
+        return list
+    return None
+
+def _find_in_matrix(data: list, target: Any):
+    """Find non-str target in list of flat lists, scanning each row in C"""
+    
+    for row_index, row in enumerate(data):
+        
+        # If not list of flat lists, let generic search handle it
+        if type(row) is not list:
+            return _NOT_MATRIX
+        if any(issubclass(element_type, (list, dict)) for element_type in set(map(type, row))):
+            return _NOT_MATRIX
+        
+        # Target is same as row or element in row
+        if row == target:
+            return row, 'value', [[list, row_index]]
+        if target in row:
+            column_index = row.index(target)
+            return row[column_index], 'value', [[list, row_index], [list, column_index]]
+    return None
+
+def find_value(data: Union[dict, list], target: Any):
     """Find value from dict and list complex data structure"""
     
-    # Initiate paths list
-    if _paths is None:
-        _paths = []
+    # Target type is loop invariant
+    target_is_str = isinstance(target, str)
     
-    # Search in case data is dict
-    if isinstance(data, dict):
-        for key, value in data.items():
-            
-            # Target is same as or contained in key
-            if key == target or (isinstance(key, str) and isinstance(target, str) and target in key):
-                found = key
-                shape = 'key'
-                _paths.insert(0, [dict, key])
-                return found, shape, _paths
-            
-            # Target is same as or contained in value
-            elif value == target or (isinstance(value, str) and isinstance(target, str) and target in value):
-                found = value
-                shape = 'value'
-                _paths.insert(0, [dict, key])
-                return found, shape, _paths
-            
-            # If no match, recursively search next data structure
-            elif isinstance(value, list) or isinstance(value, dict):
-                result = find_value(value, target, _paths)
-                
-                # If found, return result
-                if result is not None:
-                    found, shape, _paths = result
-                    _paths.insert(0, [dict, key])
-                    return found, shape, _paths
+    # If list of flat lists such as matrix, search rows without per element loop
+    if not target_is_str and type(data) is list and data and type(data[0]) is list:
+        result = _find_in_matrix(data, target)
+        if result is not _NOT_MATRIX:
+            return result
     
-    # Search in case data is list
-    elif isinstance(data, list):
-        for index, value in enumerate(data):
-            
-            # Target is same as or contained in value
-            if value == target or (isinstance(value, str) and isinstance(target, str) and target in value):
-                found = value
-                shape = 'value'
-                _paths.insert(0, [list, index])
-                return found, shape, _paths
-            
-            # If no match, recursively search next data structure
-            elif isinstance(value, list) or isinstance(value, dict):
-                result = find_value(value, target, _paths)
-                
-                # If found, return result
-                if result is not None:
-                    found, shape, _paths = result
-                    _paths.insert(0, [list, index])
-                    return found, shape, _paths
+    # Stack of open containers, searched depth first in original order
+    stack = []
+    paths = []
+    data_type = _container_type(data)
+    if data_type is dict:
+        stack.append((dict, iter(data.items())))
+    elif data_type is list:
+        stack.append((list, enumerate(data)))
+    
+    while stack:
+        shape_type, items = stack[-1]
+        
+        # If container exhausted, return to parent
+        item = next(items, None)
+        if item is None:
+            stack.pop()
+            if paths:
+                paths.pop()
+            continue
+        key, value = item
+        
+        # Target is same as or contained in key
+        if shape_type is dict and (key == target or (target_is_str and isinstance(key, str) and target in key)):
+            paths.append([dict, key])
+            return key, 'key', paths
+        
+        # Target is same as or contained in value
+        value_type = type(value)
+        if value == target or (target_is_str and isinstance(value, str) and target in value):
+            paths.append([shape_type, key])
+            return value, 'value', paths
+        
+        # If no match, search next data structure
+        if value_type is not dict and value_type is not list:
+            value_type = _container_type(value)
+        if value_type is dict:
+            paths.append([shape_type, key])
+            stack.append((dict, iter(value.items())))
+        elif value_type is list:
+            paths.append([shape_type, key])
+            stack.append((list, enumerate(value)))
     
     # If no match, return none
     return None
@@ -62,11 +93,19 @@ def find_value(data: Union[dict, list], target: Any, _paths: Union[None, list]=N
 def find_indices(data: list, target: Any) -> list[int]:
     """Find all indices of target value from list data"""
     
+    # Sequences without list.index(value, start), such as arrays, scan per element
+    if not isinstance(data, (list, tuple)):
+        return [index for index, element in enumerate(data) if element == target]
+    
+    # Let list.index scan in C between hits instead of comparing per element here
     result = []
-    for index, element in enumerate(data):
-        if element == target:
+    index = -1
+    try:
+        while True:
+            index = data.index(target, index + 1)
             result.append(index)
-    return result
+    except ValueError:
+        return result
 
 
 if __name__ == '__main__':
@@ -2,6 +2,27 @@ import struct
 
 DEFAULT_DECIMAL = 3
 
+_BOOL_TYPE_SET = {bool}
+
+# Prebuilt pack/unpack of struct formats (no format parsing per call)
+_pack_float32 = struct.Struct('>f').pack
+_unpack_float32 = struct.Struct('>f').unpack
+_pack_float64 = struct.Struct('>d').pack
+_unpack_float64 = struct.Struct('>d').unpack
+_pack_word2 = struct.Struct('>HH').pack
+_unpack_word2 = struct.Struct('>HH').unpack
+_pack_word4 = struct.Struct('>HHHH').pack
+_unpack_word4 = struct.Struct('>HHHH').unpack
+
+# Lookup tables for 16bit conversions (65536 entry table built on first use)
+_BYTE_TO_BITS = tuple([bool((byte >> i) & 1) for i in range(7, -1, -1)] for byte in range(256))
+_UINT16_TO_CHAR2 = ()
+
+def _build_uint16_to_char2():
+    global _UINT16_TO_CHAR2
+    _UINT16_TO_CHAR2 = tuple(word.to_bytes(2, 'big').decode('latin-1') for word in range(65536))
+    return _UINT16_TO_CHAR2
+
 # ┌────────────────────┐
 #   bits
 # └────────────────────┘
@@ -22,24 +43,21 @@ def bit_to_word1(bit, position):
 
 def word1_to_bits(uint16):
     if 0 <= uint16 <= 65535:
-        bits = []
-        for _ in range(16):
-            bits.append(bool(uint16 & 1))
-            uint16 >>= 1
-        bits_rev = bits[::-1]
+        bits_rev = _BYTE_TO_BITS[uint16 >> 8] + _BYTE_TO_BITS[uint16 & 0xFF]
         return bits_rev
     else:
         return None
 
 def bits_to_word1(bit00, bit01, bit02, bit03, bit04, bit05, bit06, bit07, 
                   bit08, bit09, bit10, bit11, bit12, bit13, bit14, bit15):
-    bits = [bit15, bit14, bit13, bit12, bit11, bit10, bit09, bit08,
-            bit07, bit06, bit05, bit04, bit03, bit02, bit01, bit00]
-    if all(isinstance(bit, bool) for bit in bits):
-        result = 0
-        for i, bit in enumerate(bits):
-            result |= int(bit) << i
-        return result
+    bits = (bit00, bit01, bit02, bit03, bit04, bit05, bit06, bit07,
+            bit08, bit09, bit10, bit11, bit12, bit13, bit14, bit15)
+    if set(map(type, bits)) == _BOOL_TYPE_SET:
+        result = (bit00 << 15 | bit01 << 14 | bit02 << 13 | bit03 << 12
+                  | bit04 << 11 | bit05 << 10 | bit06 << 9 | bit07 << 8
+                  | bit08 << 7 | bit09 << 6 | bit10 << 5 | bit11 << 4
+                  | bit12 << 3 | bit13 << 2 | bit14 << 1 | bit15)
+        return int(result)
     else:
         return None
     
@@ -48,14 +66,11 @@ def bits_to_word1(bit00, bit01, bit02, bit03, bit04, bit05, bit06, bit07,
 # └────────────────────┘
     
 def uint16_to_int16(uint16):
-    uint16 = int(uint16)
-    uint16 = uint16 % 65536
-    return uint16 if uint16 <= 32767 else uint16 - 65536
+    uint16 = int(uint16) & 0xFFFF
+    return uint16 - ((uint16 & 0x8000) << 1)
 
 def int16_to_uint16(int16):
-    int16 = int(int16)
-    int16 = ((int16 + 32768) % 65536) - 32768
-    return int16 + 65536 if int16 < 0 else int16
+    return int(int16) & 0xFFFF
 
 def word1_to_uint16(word0):
     int0 = int(word0)
@@ -68,8 +83,8 @@ def uint16_to_word1(uint16):
     return word0
 
 def word1_to_int16(word0):
-    uint16 = word1_to_uint16(word0) % 65536
-    return uint16 if uint16 <= 32767 else uint16 - 65536
+    uint16 = word1_to_uint16(word0) & 0xFFFF
+    return uint16 - ((uint16 & 0x8000) << 1)
 
 def int16_to_word1(int16):
     int16 = int(int16)
@@ -82,13 +97,11 @@ def int16_to_word1(int16):
 # └────────────────────┘
 
 def uint32_to_int32(uint32):
-    uint32 = int(uint32) % 4294967296
-    return uint32 if uint32 <= 2147483647 else uint32 - 4294967296
+    uint32 = int(uint32) & 0xFFFFFFFF
+    return uint32 - ((uint32 & 0x80000000) << 1)
 
 def int32_to_uint32(int32):
-    int32 = int(int32)
-    int32 = ((int32 + 2147483648) % 4294967296) - 2147483648
-    return int32 + 4294967296 if int32 < 0 else int32
+    return int(int32) & 0xFFFFFFFF
 
 def word2_to_uint32(word0, word1):
     int0 = int(word0)
@@ -111,8 +124,8 @@ def uint32_to_word2_reversed(uint32):
     return word1, word0
 
 def word2_to_int32(word0, word1):
-    uint32 = word2_to_uint32(word0, word1) % 4294967296
-    return uint32 if uint32 <= 2147483647 else uint32 - 4294967296
+    uint32 = word2_to_uint32(word0, word1) & 0xFFFFFFFF
+    return uint32 - ((uint32 & 0x80000000) << 1)
 
 def word2_to_int32_reversed(word0, word1):
     int32 = word2_to_int32(word1, word0)
@@ -135,21 +148,15 @@ def int32_to_word2_reversed(int32):
     
 def uint64_to_int64(uint64):
     uint64 = int(uint64)
-    if 0 <= uint64 <= 18446744073709551615:
-        if uint64 <= 9223372036854775807:
-            return uint64
-        else:
-            return uint64 - 18446744073709551616
+    if 0 <= uint64 <= 0xFFFFFFFFFFFFFFFF:
+        return uint64 - ((uint64 & 0x8000000000000000) << 1)
     else:
         return None
 
 def int64_to_uint64(int64):
     int64 = int(int64)
-    if -9223372036854775808 <= int64 <= 9223372036854775807:
-        if int64 < 0:
-            return int64 + 18446744073709551616
-        else:
-            return int64
+    if -0x8000000000000000 <= int64 <= 0x7FFFFFFFFFFFFFFF:
+        return int64 & 0xFFFFFFFFFFFFFFFF
     else:
         return None
 
@@ -191,50 +198,80 @@ def int64_to_word4(int64):
 # └────────────────────┘
 
 def word2_to_float32(word0, word1, decimal=DEFAULT_DECIMAL):
-    bin0 = (int(word0) & 0xFFFF) << 16
-    bin1 = (int(word1) & 0xFFFF)
-    bin2 = bin0 | bin1
-    float32 = struct.unpack('>f', struct.pack('>I', bin2))[0]
+    float32 = _unpack_float32(_pack_word2(int(word0) & 0xFFFF,
+                                          int(word1) & 0xFFFF))[0]
     return round(float32, decimal)
 
 def word2_to_float32_reversed(word0, word1, decimal=DEFAULT_DECIMAL):
     float32 = word2_to_float32(word1, word0, decimal)
     return float32
 
+def _pack_words(words):
+    try:
+        return struct.pack(f'>{len(words)}H', *words)
+    except struct.error:
+        # Normalize same as scalar conversions (str, negative or over 16bit words)
+        return struct.pack(f'>{len(words)}H', *[int(word) & 0xFFFF for word in words])
+
+def word2_to_float32_batch(words, decimal=DEFAULT_DECIMAL):
+    count = len(words) // 2
+    raw = _pack_words(words[:count * 2])
+    return [round(float32, decimal) for float32 in struct.unpack(f'>{count}f', raw)]
+
+def word2_to_float32_reversed_batch(words, decimal=DEFAULT_DECIMAL):
+    count = len(words) // 2
+    words_swapped = [None] * (count * 2)
+    words_swapped[0::2] = words[1:count * 2:2]
+    words_swapped[1::2] = words[0:count * 2:2]
+    return word2_to_float32_batch(words_swapped, decimal)
+
 def float32_to_word2(float32):
-    float32 = float(float32)
-    bin_float = struct.pack('>f', float32)
-    uint32 = struct.unpack('>I', bin_float)[0]
-    word0 = (uint32 >> 16) & 0xFFFF
-    word1 = uint32 & 0xFFFF
-    return word0, word1
+    return _unpack_word2(_pack_float32(float(float32)))
 
 def float32_to_word2_reversed(float32):
     word0, word1 = float32_to_word2(float32)
     return word1, word0
 
+def _pack_floats(format_char, floats):
+    try:
+        return struct.pack(f'>{len(floats)}{format_char}', *floats)
+    except struct.error:
+        # Normalize same as scalar conversions (e.g. str values)
+        return struct.pack(f'>{len(floats)}{format_char}', *[float(value) for value in floats])
+
+def float32_to_word2_batch(float32s):
+    count = len(float32s)
+    raw = _pack_floats('f', float32s)
+    return list(struct.unpack(f'>{count * 2}H', raw))
+
+def float32_to_word2_reversed_batch(float32s):
+    words = float32_to_word2_batch(float32s)
+    words[0::2], words[1::2] = words[1::2], words[0::2]
+    return words
+
 # ┌────────────────────┐
 #   float64
 # └────────────────────┘
 
 def word4_to_float64(word0, word1, word2, word3, decimal=DEFAULT_DECIMAL):
-    bin0 = (int(word0) & 0xFFFF) << 48
-    bin1 = (int(word1) & 0xFFFF) << 32
-    bin2 = (int(word2) & 0xFFFF) << 16
-    bin3 = (int(word3) & 0xFFFF)
-    bin4 = bin0 | bin1 | bin2 | bin3
-    float64 = struct.unpack('>d', struct.pack('>Q', bin4))[0]
+    float64 = _unpack_float64(_pack_word4(int(word0) & 0xFFFF,
+                                          int(word1) & 0xFFFF,
+                                          int(word2) & 0xFFFF,
+                                          int(word3) & 0xFFFF))[0]
     return round(float64, decimal)
 
+def word4_to_float64_batch(words, decimal=DEFAULT_DECIMAL):
+    count = len(words) // 4
+    raw = _pack_words(words[:count * 4])
+    return [round(float64, decimal) for float64 in struct.unpack(f'>{count}d', raw)]
+
 def float64_to_word4(float64):
-    float64 = float(float64)
-    bin_float = struct.pack('>d', float64)
-    uint64 = struct.unpack('>Q', bin_float)[0]
-    word0 = (uint64 >> 48) & 0xFFFF
-    word1 = (uint64 >> 32) & 0xFFFF
-    word2 = (uint64 >> 16) & 0xFFFF
-    word3 = uint64 & 0xFFFF
-    return word0, word1, word2, word3
+    return _unpack_word4(_pack_float64(float(float64)))
+
+def float64_to_word4_batch(float64s):
+    count = len(float64s)
+    raw = _pack_floats('d', float64s)
+    return list(struct.unpack(f'>{count * 4}H', raw))
 
 # ┌────────────────────┐
 #   fixed32
@@ -243,28 +280,20 @@ def float64_to_word4(float64):
 def word2_to_fixed32(word0, word1, decimal=DEFAULT_DECIMAL,
                      sign_bit=1, integer_bit=15, fraction_bit=16):
     
-    # Convert two 16bit words to 16bit bins
-    bin0 = format(word0, '016b')
-    bin1 = format(word1, '016b')
-    
-    # Combine two 16bit bins to 32bit bin
-    bin2 = bin0 + bin1
+    # Combine two 16bit words to 32bit raw
+    raw = ((word0 & 0xFFFF) << 16) | (word1 & 0xFFFF)
     
     # Calculate sign
-    sign = -1 if bin2[0] == '1' else 1
+    sign = -1 if raw & 0x80000000 else 1
     
     # Calculate integer part
-    integer_begin = sign_bit
-    integer_end = sign_bit + integer_bit
-    integer_bin = bin2[integer_begin : integer_end]
-    integer = int(integer_bin, 2)
+    integer_shift = 32 - sign_bit - integer_bit
+    integer = (raw >> integer_shift) & ((1 << integer_bit) - 1)
     
     # Calculate fraction part
-    fraction_begin = sign_bit + integer_bit
-    fraction_end = sign_bit + integer_bit + fraction_bit
-    fraction_bin = bin2[fraction_begin : fraction_end]
-    fraction_divider = 2 ** fraction_bit
-    fraction = int(fraction_bin, 2) / fraction_divider
+    fraction_shift = integer_shift - fraction_bit
+    fraction_raw = (raw >> fraction_shift) & ((1 << fraction_bit) - 1)
+    fraction = fraction_raw / (1 << fraction_bit)
     
     # Calculate float
     fixed32 = sign * (integer + fraction)
@@ -289,12 +318,15 @@ def fixed32_to_word2(fixed32, sign_bit=1, integer_bit=15, fraction_bit=16):
     # Calculate fraction part
     fraction = int((fixed32 - integer) * (2 ** fraction_bit))
     
-    # Combine all to form a binary string
-    bin_str = f'{sign:0{sign_bit}b}{integer:0{integer_bit}b}{fraction:0{fraction_bit}b}'
+    # Combine all to form a raw integer
+    raw = (((sign & ((1 << sign_bit) - 1)) << (integer_bit + fraction_bit))
+           | ((integer & ((1 << integer_bit) - 1)) << fraction_bit)
+           | (fraction & ((1 << fraction_bit) - 1)))
     
     # Split into two words
-    word0 = int(bin_str[:16], 2)
-    word1 = int(bin_str[16:], 2)
+    low_bit = sign_bit + integer_bit + fraction_bit - 16
+    word0 = raw >> low_bit
+    word1 = raw & ((1 << low_bit) - 1)
     
     return word0, word1
 
@@ -309,33 +341,24 @@ def fixed32_to_word2_reversed(fixed32, sign_bit=1, integer_bit=15, fraction_bit=
 def word4_to_fixed64(word0, word1, word2, word3, decimal=DEFAULT_DECIMAL,
                      sign_bit=1, integer_bit=31, fraction_bit=32):
     
-    # Convert four 16bit words to 16bit bins
-    bin0 = format(word0, '016b')
-    bin1 = format(word1, '016b')
-    bin2 = format(word2, '016b')
-    bin3 = format(word3, '016b')
-    
-    # Combine four 16bit bins to 32bit bin
-    bin4 = bin0 + bin1 + bin2 + bin3
+    # Combine four 16bit words to 64bit raw
+    raw = (((word0 & 0xFFFF) << 48) | ((word1 & 0xFFFF) << 32)
+           | ((word2 & 0xFFFF) << 16) | (word3 & 0xFFFF))
     
     # Calculate sign
-    sign = -1 if bin4[0] == '1' else 1
+    sign = -1 if raw & 0x8000000000000000 else 1
     
     # Calculate integer part
-    integer_begin = sign_bit
-    integer_end = sign_bit + integer_bit
-    integer_bin = bin4[integer_begin : integer_end]
-    integer = int(integer_bin, 2)
+    integer_shift = 64 - sign_bit - integer_bit
+    integer = (raw >> integer_shift) & ((1 << integer_bit) - 1)
     
     # Calculate fraction part
-    faction_begin = sign_bit + integer_bit
-    faction_end = sign_bit + integer_bit + fraction_bit
-    faction_bin = bin4[faction_begin : faction_end]
-    faction_divider = 2 ** fraction_bit
-    faction = int(faction_bin, 2) / faction_divider
+    fraction_shift = integer_shift - fraction_bit
+    fraction_raw = (raw >> fraction_shift) & ((1 << fraction_bit) - 1)
+    fraction = fraction_raw / (1 << fraction_bit)
     
     # Calculate float
-    fixed64 = sign * (integer + faction)
+    fixed64 = sign * (integer + fraction)
     return round(fixed64, decimal)
 
 def fixed64_to_word4(fixed64, sign_bit=1, integer_bit=31, fraction_bit=32):
@@ -351,14 +374,17 @@ def fixed64_to_word4(fixed64, sign_bit=1, integer_bit=31, fraction_bit=32):
     # Calculate fraction part
     fraction = int((fixed64 - integer) * (2 ** fraction_bit))
     
-    # Combine all to form a binary string
-    bin_str = f'{sign:0{sign_bit}b}{integer:0{integer_bit}b}{fraction:0{fraction_bit}b}'
+    # Combine all to form a raw integer
+    raw = (((sign & ((1 << sign_bit) - 1)) << (integer_bit + fraction_bit))
+           | ((integer & ((1 << integer_bit) - 1)) << fraction_bit)
+           | (fraction & ((1 << fraction_bit) - 1)))
     
     # Split into four words
-    word0 = int(bin_str[:16], 2)
-    word1 = int(bin_str[16:32], 2)
-    word2 = int(bin_str[32:48], 2)
-    word3 = int(bin_str[48:], 2)
+    low_bit = sign_bit + integer_bit + fraction_bit - 48
+    word0 = raw >> (low_bit + 32)
+    word1 = (raw >> (low_bit + 16)) & 0xFFFF
+    word2 = (raw >> low_bit) & 0xFFFF
+    word3 = raw & ((1 << low_bit) - 1)
     
     return word0, word1, word2, word3
 
@@ -368,20 +394,21 @@ def fixed64_to_word4(fixed64, sign_bit=1, integer_bit=31, fraction_bit=32):
 
 def word1_to_char2(word):
     if 0 <= word <= 65535:
-        char1 = chr((word >> 8) & 0xFF)
-        char2 = chr(word & 0xFF)
-        return char1 + char2
+        return (_UINT16_TO_CHAR2 or _build_uint16_to_char2())[word]
     else:
         return None
 
 def char2_to_word1(char2):
     if len(char2) == 2:
-        word = (ord(char2[0]) << 8) | ord(char2[1])
+        word = int.from_bytes(char2.encode('latin-1'), 'big')
         return word
     else:
         return None
 
-if __name__ == '__main__':
+def words_to_str(words):
+    return struct.pack(f'>{len(words)}H', *words).decode('latin-1')
+
+def _demo():
     while True:
         word1 = input('word1: ')
         word2 = input('word2: ')
@@ -396,4 +423,7 @@ if __name__ == '__main__':
 
         # int16 = input('int16: ')
         # res = int16_to_uint16(int16)
-        # print(res)
\ No newline at end of file
+        # print(res)
+
+if __name__ == '__main__':
+    _demo()
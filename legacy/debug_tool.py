@@ -4,9 +4,16 @@ import tracemalloc
 class MemoryTool:
     """Memory Measuring Tool"""
 
+    TRACE_FILTERS = (
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    )
+
     def __init__(self, report_num=10, key_type='lineno'):
         self.report_num = report_num
         self.key_type = key_type
+        self.snapshot = None
+        self.prev_snapshot = None
         
         # Start memory tracing
         tracemalloc.start()
@@ -14,17 +21,15 @@ class MemoryTool:
     def take_snapshot(self):
         """Take memory snapshot in line"""
         
-        # Take memory snapshot
+        # Keep previous snapshot for diff, then take memory snapshot
+        self.prev_snapshot = self.snapshot
         self.snapshot = tracemalloc.take_snapshot()
     
     def print_snapshot(self):
         """Print memory snapshot"""
         
         # Filter trace from snapshot
-        self.trace = self.snapshot.filter_traces((
-            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
-            tracemalloc.Filter(False, '<unknown>'),
-        ))
+        self.trace = self.snapshot.filter_traces(self.TRACE_FILTERS)
         
         # Refine total items from trace
         total_items = self.trace.statistics(self.key_type)
@@ -45,18 +50,43 @@ class MemoryTool:
                   (f'  > Line: {item_line}\n'),
                   (f'  > Code: {item_code}\n'))
         
+        # Sum total once, rest is total minus top
+        total_num = len(total_items)
+        total_size = sum(i.size for i in total_items) / 1024
+        top_size = sum(i.size for i in top_items) / 1024
+        
         # Print rest items
-        rest_items = total_items[self.report_num:]
-        if rest_items:
-            rest_num = len(rest_items)
-            rest_size = sum(i.size for i in rest_items) / 1024
+        rest_num = total_num - len(top_items)
+        if rest_num:
+            rest_size = total_size - top_size
             print(f'Rest {rest_num} items: {rest_size:.1f}KB')
         
         # Print total summary
-        total_num = len(total_items)
-        total_size = sum(i.size for i in total_items) / 1024
         print(f'Total {total_num} items: {total_size:.1f}KB\n')
     
+    def print_snapshot_diff(self):
+        """Print top N memory changes since previous snapshot"""
+        
+        # If no previous snapshot, nothing to compare
+        if self.prev_snapshot is None:
+            print('No previous snapshot\n')
+            return
+        
+        # Compare filtered snapshots
+        current = self.snapshot.filter_traces(self.TRACE_FILTERS)
+        previous = self.prev_snapshot.filter_traces(self.TRACE_FILTERS)
+        diff_items = current.compare_to(previous, self.key_type)
+        
+        # Print top N changes
+        print(f'Top {self.report_num} changes\n')
+        for n, i in enumerate(diff_items[:self.report_num], 1):
+            frame = i.traceback[0]
+            item_size_diff = i.size_diff / 1024
+            item_size = i.size / 1024
+            print((f'#{n}: {item_size_diff:+.1f}KB (now {item_size:.1f}KB)\n'),
+                  (f'  > File: {frame.filename}\n'),
+                  (f'  > Line: {frame.lineno}\n'))
+    
 import inspect
 
 def print_current_line_number():
@@ -1,8 +1,10 @@
 import time
+from collections import namedtuple
+from functools import cache
 import platform
 import psutil
-import subprocess
-from threading import Thread
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pkg.exception_tool import try_pass
 
 KB = 1024
@@ -11,107 +13,214 @@ GB = 1024 ** 3
 TB = 1024 ** 4
 MEASURE_DECIMAL = 3
 PERCENT_DECIMAL = 1
+DISK_BLOCK_SIZE = 512
+SNAPSHOT_TTL_SEC = 0.25
+
+DeviceSnapshot = namedtuple('DeviceSnapshot', ['memory', 'swap', 'disk'])
+
+# Values never change during process lifetime, so read them once
+
+@cache
+def _time_zone():
+    DST_tm, Non_DST_tm = time.tzname
+    return Non_DST_tm
+
+@cache
+def _os_platform():
+    result = platform.platform()
+    return result
+
+@cache
+def _os_type():
+    result = platform.system()
+    return result
+
+@cache
+def _os_version():
+    info = platform.freedesktop_os_release()
+    result = info["VERSION"]
+    return result
+
+@cache
+def _kernel_version():
+    result = platform.release()
+    return result
+
+@cache
+def _cpu_architecture():
+    result = platform.machine()
+    return result
+
+@cache
+def _libc_version():
+    info = platform.libc_ver()
+    result = "-".join(info)
+    return result
+
+@cache
+def _python_version():
+    result = platform.python_version()
+    return result
+
+@cache
+def _cpu_info():
+    result = platform.processor()
+    return result
+
+@cache
+def _cpu_frequency_ghz():
+    frequency = psutil.cpu_freq()
+    result = round(frequency.max / KB, MEASURE_DECIMAL)
+    return result
+
+@cache
+def _cpu_core_quantity():
+    result = psutil.cpu_count()
+    return result
+
+@cache
+def _memory_total_gb():
+    memory = psutil.virtual_memory()
+    result = round(memory.total / GB, MEASURE_DECIMAL)
+    return result
+    # free | grep Mem | awk '{print $2}'
+
+@cache
+def _disk_total_gb():
+    disk = psutil.disk_usage('/')
+    result = round(disk.total / GB, MEASURE_DECIMAL)
+    return result
+    # df / -hP 2>/dev/null | grep -v ^Filesystem | awk '{sum += $2} END {print sum}'
+
+def _add_entry_size(entry, linked):
+    """Return allocated size of entry, deferring hard linked files to linked"""
+    stat = entry.stat(follow_symlinks=False)
+    size = stat.st_blocks * DISK_BLOCK_SIZE
+    if stat.st_nlink > 1 and not entry.is_dir(follow_symlinks=False):
+        linked[(stat.st_dev, stat.st_ino)] = size
+        return 0
+    return size
+
+def _get_tree_size(path):
+    """Sum allocated size of entries under path, like du"""
+    size = 0
+    linked = {}
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        size += _add_entry_size(entry, linked)
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return size, linked
+
+def _read_or_none(read, *args):
+    """Read one snapshot source, None if it fails (others still read)"""
+    try:
+        return read(*args)
+    except Exception:
+        return None
 
 class DeviceTool:
     """Device Monitoring Tool"""
     
-    def __init__(self):
-        self.get_cpu_result = None
+    def __init__(self, snapshot_ttl=SNAPSHOT_TTL_SEC):
+        psutil.cpu_percent(interval=None)
+        self.snapshot_ttl = snapshot_ttl
+        self._snapshot = None
+        self._snapshot_time = None
+
+    def snapshot(self):
+        """Read memory, swap, disk usage at once, reused within ttl"""
+        now = time.monotonic()
+        if self._snapshot is None or now - self._snapshot_time >= self.snapshot_ttl:
+            self._snapshot = DeviceSnapshot(memory=_read_or_none(psutil.virtual_memory),
+                                            swap=_read_or_none(psutil.swap_memory),
+                                            disk=_read_or_none(psutil.disk_usage, '/'))
+            self._snapshot_time = now
+        return self._snapshot
 
     @try_pass
     def get_time_zone(self):
-        DST_tm, Non_DST_tm = time.tzname
-        return Non_DST_tm
+        return _time_zone()
 
     @try_pass
     def get_os_platform(self):
-        result = platform.platform()
-        return result
+        return _os_platform()
 
     @try_pass
     def get_os_type(self):
-        result = platform.system()
-        return result
+        return _os_type()
 
     @try_pass
     def get_os_version(self):
-        info = platform.freedesktop_os_release()
-        result = info["VERSION"]
-        return result
+        return _os_version()
 
     @try_pass
     def get_kernel_version(self):
-        result = platform.release()
-        return result
+        return _kernel_version()
     
     @try_pass
     def get_cpu_architecture(self):
-        result = platform.machine()
-        return result
+        return _cpu_architecture()
     
     @try_pass
     def get_libc_version(self):
-        info = platform.libc_ver()
-        result = "-".join(info)
-        return result
+        return _libc_version()
     
     @try_pass
     def get_python_version(self):
-        result = platform.python_version()
-        return result
+        return _python_version()
 
     @try_pass
     def get_cpu_info(self):
-        result = platform.processor()
-        return result
+        return _cpu_info()
 
     @try_pass
     def get_cpu_frequency_ghz(self):
-        frequency = psutil.cpu_freq()
-        result = round(frequency.max / KB, MEASURE_DECIMAL)
-        return result
+        return _cpu_frequency_ghz()
 
     @try_pass
     def get_cpu_core_quantity(self):
-        result = psutil.cpu_count()
-        return result
+        return _cpu_core_quantity()
 
     @try_pass
-    def get_cpu_usage_perc(self, interval=1):
-
-        def _get_cpu_usage_perc(interval):
-            percent = psutil.cpu_percent(interval=interval)
-            self.get_cpu_result = percent
+    def get_cpu_usage_perc(self, interval=None):
+        # If interval given, measure over interval (blocking)
+        if interval is not None:
+            return self.get_cpu_usage_perc_blocking(interval)
         
-        thread = Thread(target = _get_cpu_usage_perc,
-                     args = (interval, ),
-                     daemon = True)
-        thread.start()
-        result = self.get_cpu_result
+        # Usage since previous call, primed in __init__
+        result = psutil.cpu_percent(interval=None)
         return result
         # htop
         # mpstat | tail -1 | awk '{print 100-$NF}'
 
     @try_pass
-    def get_memory_total_gb(self):
-        memory = psutil.virtual_memory()
-        result = round(memory.total / GB, MEASURE_DECIMAL)
+    def get_cpu_usage_perc_blocking(self, interval=1):
+        result = psutil.cpu_percent(interval=interval)
         return result
-        # free | grep Mem | awk '{print $2}'
+
+    @try_pass
+    def get_memory_total_gb(self):
+        return _memory_total_gb()
 
     @try_pass
     def get_swap_total_gb(self):
-        swap = psutil.swap_memory()
+        swap = self.snapshot().swap
         result = round(swap.total / GB, MEASURE_DECIMAL)
         return result
         # free | grep Swap | awk '{print $2}'
 
     @try_pass
     def get_disk_total_gb(self):
-        disk = psutil.disk_usage('/')
-        result = round(disk.total / GB, MEASURE_DECIMAL)
-        return result
-        # df / -hP 2>/dev/null | grep -v ^Filesystem | awk '{sum += $2} END {print sum}'
+        return _disk_total_gb()
     
     @try_pass
     def get_sensors_temperature(self):
@@ -133,48 +242,65 @@ class DeviceTool:
 
     @try_pass
     def get_memory_usage_gb(self):
-        memory = psutil.virtual_memory()
+        memory = self.snapshot().memory
         result = round(memory.used / GB, MEASURE_DECIMAL)
         return result
         # free | grep Mem | awk '{print $3}'
 
     @try_pass
     def get_memory_usage_perc(self):
-        memory = psutil.virtual_memory()
+        memory = self.snapshot().memory
         result = round(memory.percent, PERCENT_DECIMAL)
         return result
 
     @try_pass
     def get_swap_usage_gb(self):
-        swap = psutil.swap_memory()
+        swap = self.snapshot().swap
         result = round(swap.used / GB, MEASURE_DECIMAL)
         return result
         # free | grep Swap | awk '{print $3}'
 
     @try_pass
     def get_swap_usage_perc(self):
-        swap = psutil.swap_memory()
+        swap = self.snapshot().swap
         result = round(swap.percent, PERCENT_DECIMAL)
         return result
 
     @try_pass
     def get_disk_usage_gb(self):
-        disk = psutil.disk_usage('/')
+        disk = self.snapshot().disk
         result = round(disk.used / GB, MEASURE_DECIMAL)
         return result
         # df / -hP 2>  | grep -v ^Filesystem | awk '{sum += $3} END {print sum}'
 
     @try_pass
     def get_disk_usage_perc(self):
-        disk = psutil.disk_usage('/')
+        disk = self.snapshot().disk
         result = round(disk.percent, PERCENT_DECIMAL)
         return result
 
     @try_pass
     def get_dir_size_gb(self, path):
-        command = ['du', '-s', path]
-        result = subprocess.run(command, stdout=subprocess.PIPE)
-        output = result.stdout.decode('utf-8').strip()
-        size_kb = output.split()[0]
-        result = round(int(size_kb) / MB, MEASURE_DECIMAL)
-        return result
\ No newline at end of file
+        
+        # Walk top level here, then subdirs in parallel since stat releases GIL
+        size = os.stat(path).st_blocks * DISK_BLOCK_SIZE
+        linked = {}
+        subdirs = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    size += _add_entry_size(entry, linked)
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                except OSError:
+                    continue
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for subdir_size, subdir_linked in executor.map(_get_tree_size, subdirs):
+                size += subdir_size
+                linked.update(subdir_linked)
+        
+        # Count hard linked files once, as du does
+        size += sum(linked.values())
+        result = round(size / GB, MEASURE_DECIMAL)
+        return result
+        # du -s <path>
\ No newline at end of file
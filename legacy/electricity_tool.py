@@ -1,5 +1,7 @@
 from math import trunc
 
+_METER_COMM_TRUE_VALUES = ('True', True, '1')
+
 
 def calculate_float_energy(energy_float: float,
                            energy_int_raw: int,
@@ -14,14 +16,31 @@ def calculate_float_energy(energy_float: float,
     energy_float_now = float(energy_float)
     
     # If meter communication is not ok, return now-float-energy as is
-    meter_comm = True if meter_comm == 'True' or meter_comm == True or meter_comm == '1' else False
+    if meter_comm is not True and meter_comm is not False:
+        meter_comm = meter_comm in _METER_COMM_TRUE_VALUES
     if not meter_comm:
         return energy_float_now
 
     # Create essential data 2
-    energy_float_now_trunc = trunc(energy_float_now)
     energy_int_raw = float(int(energy_int_raw))
     power_float_raw = float(power_float_raw)
+    return _calculate_float_energy_core(energy_float_now,
+                                        energy_int_raw,
+                                        power_float_raw,
+                                        update_cycle_sec,
+                                        decimal,
+                                        energy_is_signed)
+
+
+def _calculate_float_energy_core(energy_float_now: float,
+                                 energy_int_raw: float,
+                                 power_float_raw: float,
+                                 update_cycle_sec: float,
+                                 decimal: int,
+                                 energy_is_signed: bool) -> float:
+    """Calculate float energy from already coerced float inputs"""
+    
+    energy_float_now_trunc = trunc(energy_float_now)
     energy_float_new = round(energy_float_now + power_float_raw * update_cycle_sec / 3600, decimal)
     energy_float_added = energy_float_new - energy_int_raw
 
@@ -47,7 +66,6 @@ def calculate_float_energy(energy_float: float,
     # Else, return now-float-energy as is
     return energy_float_now
 
-
 if __name__ == '__main__':
     energy_float = 0.0
     energy_int = 0
@@ -2,8 +2,14 @@ import os
 
 def change_mode(path, mode):
     mode_new = int(str(mode), 8)
-    mode_old = os.stat(path).st_mode & 0o777
+    
+    # If file descriptor given, skip path lookup
+    if isinstance(path, int):
+        mode_old = os.fstat(path).st_mode & 0o777
+        os.fchmod(path, mode_new)
+    else:
+        mode_old = os.stat(path).st_mode & 0o777
+        os.chmod(path, mode_new)
     mode_old_oct = oct(mode_old)
-    os.chmod(path, mode_new)
     mode_new_oct = oct(mode_new)
     return mode_old_oct, mode_new_oct
\ No newline at end of file
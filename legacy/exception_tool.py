@@ -1,8 +1,31 @@
+from functools import wraps
+from inspect import CO_VARARGS, CO_VARKEYWORDS
+
+def try_default(default=None):
+    """Try and return default if exception incurs"""
+    def decorator(func):
+        code = func.__code__
+        
+        # If single positional argument only (e.g. method taking self), skip args packing
+        if (code.co_argcount == 1 and code.co_kwonlyargcount == 0 and not func.__defaults__
+                and not code.co_flags & (CO_VARARGS | CO_VARKEYWORDS)):
+            @wraps(func)
+            def wrapper(arg):
+                try:
+                    return func(arg)
+                except Exception:
+                    return default
+            return wrapper
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                return default
+        return wrapper
+    return decorator
+
 def try_pass(func):
     """Try and pass if exception incurs"""
-    def wrapper(*args, **kwargs):
-        try:
-            return func(*args, **kwargs)
-        except Exception as exc:
-            return None
-    return wrapper
\ No newline at end of file
+    return try_default(None)(func)
\ No newline at end of file
@@ -1,5 +1,21 @@
+from numbers import Integral, Real
 from influxdb import InfluxDBClient as _InfluxDBClient
 
+# Line protocol escaping tables
+_MEAS_ESCAPE = str.maketrans({',': '\\,', ' ': '\\ '})
+_KEY_ESCAPE = str.maketrans({',': '\\,', '=': '\\=', ' ': '\\ '})
+_FIELD_STR_ESCAPE = str.maketrans({'"': '\\"', '\\': '\\\\'})
+
+def _format_field_value(value):
+    """Format field value in line protocol"""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, Integral):
+        return f'{int(value)}i'
+    if isinstance(value, Real):
+        return repr(float(value))
+    return f'"{str(value).translate(_FIELD_STR_ESCAPE)}"'
+
 class InfluxDbClient:
     """InfluxDB Client"""
     # db = sum(meas)
@@ -8,12 +24,13 @@ class InfluxDbClient:
     # ser = meas + tag
 
     def __init__(self, host='localhost', port=8086,
-                 username='root', password='root', db=None):
+                 username='root', password='root', db=None, gzip=False):
         self.host = host
         self.port = port
         self.username = username
         self.password = password
         self.db = db
+        self.gzip = gzip
     
     def connect(self):
         """Connect DB"""
@@ -22,7 +39,8 @@ class InfluxDbClient:
                                       port=self.port,
                                       username=self.username,
                                       password=self.password,
-                                      database=self.db)
+                                      database=self.db,
+                                      gzip=self.gzip)
 
     def disconnect(self):
         """Disconnect DB"""
@@ -125,6 +143,31 @@ class InfluxDbClient:
                                    database=db)
         points = list(result.get_points())
         return points
+
+    def fetch_all_columns(self, query, db=None):
+        """Execute SQL and fetch all results as dict of columns"""
+        # {'time': [...], 'v': [...], ...}, built from raw series values
+        # without creating dict per point
+        # (columns missing in a series filled with None, so rows line up)
+        result = self.client.query(query=query,
+                                   database=db)
+        columns = {}
+        rows = 0
+        for series in result.raw.get('series', []):
+            values = series.get('values', [])
+            count = len(values)
+            series_columns = dict(zip(series['columns'], zip(*values)))
+            for tag, value in (series.get('tags') or {}).items():
+                series_columns.setdefault(tag, (value,) * count)
+            for name, column in series_columns.items():
+                if name not in columns:
+                    columns[name] = [None] * rows
+                columns[name].extend(column)
+            for name, column in columns.items():
+                if name not in series_columns:
+                    column.extend([None] * count)
+            rows += count
+        return columns
     
     def read_series(self, db=None, measurement=None, tag=None):
         """Read series list"""
@@ -152,6 +195,39 @@ class InfluxDbClient:
                                           batch_size=batch_size)
         return result
 
+    def write_points_bulk(self, measurement, tag_columns, field_columns, times,
+                          time_unit='s', db=None, retpol=None, batch_size=None):
+        """Write points given as columns, serialized directly to line protocol"""
+        # tag_columns = {'loc': ['beom', 'beom'], 'fac': ['chem', 'bio']}
+        # field_columns = {'v': [123, 124], 'i': [4.5, 4.6]}
+        # times = [1669848655, 1669848656]
+        
+        # Escape names once per column instead of once per point
+        prefix = measurement.translate(_MEAS_ESCAPE)
+        tag_keys = [key.translate(_KEY_ESCAPE) for key in tag_columns]
+        field_keys = [key.translate(_KEY_ESCAPE) for key in field_columns]
+        
+        # Build one line per point, skipping empty tags and fields
+        lines = []
+        for index, time in enumerate(times):
+            tags = ''.join(f',{key}={str(values[index]).translate(_KEY_ESCAPE)}'
+                           for key, values in zip(tag_keys, tag_columns.values())
+                           if values[index] is not None)
+            fields = ','.join(f'{key}={_format_field_value(values[index])}'
+                              for key, values in zip(field_keys, field_columns.values())
+                              if values[index] is not None)
+            if fields:
+                lines.append(f'{prefix}{tags} {fields} {time}')
+        
+        # Send lines as is through client session
+        result = self.client.write_points(points=lines,
+                                          time_precision=time_unit,
+                                          database=db,
+                                          retention_policy=retpol,
+                                          batch_size=batch_size,
+                                          protocol='line')
+        return result
+
 if __name__ == '__main__':
     influx = InfluxDbClient(db='nodi')
     influx.connect()
@@ -1,4 +1,57 @@
+import codecs
+import gzip
 import json
+from math import isfinite
+try:
+    import orjson
+    # Types stdlib rejects handed to default, so failing alike (with or without orjson)
+    _ORJSON_OPTIONS = (orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                       | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+except ImportError:
+    orjson = None
+
+GZIP_COMPRESS_LEVEL = 1
+JSON_INDENT = 4
+
+def _has_non_finite(object) -> bool:
+    """Check for NaN/Infinity floats (orjson would write them as null)"""
+    stack = [object]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+def _reject(object):
+    raise TypeError(f'Object of type {type(object).__name__} is not JSON serializable')
+
+def _dumps(object) -> bytes:
+    """Serialize to indented utf-8 bytes, with orjson if available and lossless"""
+    """
+    * orjson output is indented by 2, stdlib output (fallback) by 4.
+    * orjson still accepts UUID, Enum and non-str keys such as datetime,
+      which stdlib rejects.
+    """
+    if orjson is not None:
+        try:
+            data = orjson.dumps(object, default=_reject, option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            data = None
+        
+        # NaN/Infinity written as null, so scan only if output has null
+        if data is not None and (b'null' not in data or not _has_non_finite(object)):
+            return data
+    return json.dumps(object, indent=JSON_INDENT).encode('utf-8')
+
+def _loads(data: bytes):
+    """Deserialize utf-8 bytes (stdlib, keeping integers beyond 64bit exact)"""
+    return json.loads(data)
 
 class Json:
     """json 파일 제어"""
@@ -6,16 +59,34 @@ class Json:
     def __init__(self, path, encoding="UTF8"):
         self.path = path
         self.encoding = encoding
+        self._is_utf8 = codecs.lookup(encoding).name == "utf-8"
 
     def read(self):
         """데이터 읽기"""
-        with open(self.path, "r", encoding=self.encoding) as file:
-            return json.load(file)
+        if not self._is_utf8:
+            with open(self.path, "r", encoding=self.encoding) as file:
+                return json.load(file)
+        with open(self.path, "rb") as file:
+            return _loads(file.read())
 
     def write(self, object):
         """ 기존 데이터 삭제, 새 데이터 쓰기"""
-        with open(self.path, "w", encoding=self.encoding) as file:
-            json.dump(object, file, indent=4)
+        if not self._is_utf8:
+            with open(self.path, "w", encoding=self.encoding) as file:
+                json.dump(object, file, indent=JSON_INDENT)
+            return
+        with open(self.path, "wb") as file:
+            file.write(_dumps(object))
+
+    def read_gz(self):
+        """gzip 압축 데이터 읽기"""
+        with gzip.open(self.path, "rb") as file:
+            return _loads(file.read())
+
+    def write_gz(self, object):
+        """기존 데이터 삭제, 새 데이터 gzip 압축 쓰기 (대용량 데이터용)"""
+        with gzip.open(self.path, "wb", compresslevel=GZIP_COMPRESS_LEVEL) as file:
+            file.write(_dumps(object))
 
     def append(self, keypath, value):
         """(미완성) 기존 데이터 유지, 새 데이터 쓰기"""
@@ -26,10 +97,7 @@ class Json:
         pass
 
 
-if __name__ == "__main__":
-    import pprint
-    import datetime
-    import random
+def _demo():
     import time
 
     js = Json("./file/test.json")
@@ -53,3 +121,7 @@ if __name__ == "__main__":
         print(count)
 
     print(time.time()-start)
+
+
+if __name__ == "__main__":
+    _demo()
@@ -1,7 +1,14 @@
 from confluent_kafka import Producer, Consumer, TopicPartition
 from confluent_kafka.admin import AdminClient, NewTopic, ConfigResource
 from collections import deque
+from concurrent.futures import as_completed
+from itertools import repeat
+from queue import Queue, Empty, Full
+from threading import Event, Lock, Thread
 from time import sleep, time
+import logging
+
+log = logging.getLogger('kafka')
 
 class KafkaClient:
     """Kafka Client"""
@@ -21,49 +28,114 @@ class KafkaClient:
 class KafkaProducer(KafkaClient):
     """Kafka Producer"""
     
+    # Batch messages for a few ms instead of sending one request per message
+    DEFAULT_CONFIGS = {'linger.ms': 5,
+                       'batch.size': 65536,
+                       'compression.type': 'lz4',
+                       'acks': 1,
+                       'enable.idempotence': False,}
+    
+    # Alternate profile for bulk transfer, pass as custom_configs
+    HIGH_THROUGHPUT_CONFIGS = {'linger.ms': 100,
+                               'batch.size': 409600,
+                               'compression.type': 'lz4',
+                               'acks': 1,}
+    
+    # Optional user callback on delivery, called as on_produce(error, message)
+    on_produce = None
+    
     def __init__(self, host: str = '127.0.0.1', port: int = 9092,
-                 client_id: str = 'nodi-client', custom_configs: dict = {}):
+                 client_id: str = 'nodi-client', custom_configs: dict = None,
+                 on_produce=None, poll_interval: float = 0.1):
         super().__init__(host, port)
         
-        # Create producer configs
-        self.producer_configs = {'client.id': client_id,}
-        self.producer_configs.update(self.client_configs)
-        self.producer_configs.update(custom_configs)
+        # Create producer configs (custom configs override defaults)
+        self.producer_configs = {'client.id': client_id,
+                                 **self.DEFAULT_CONFIGS,
+                                 **self.client_configs,
+                                 **(custom_configs or {}),}
+        
+        # Count delivery reports instead of handling each message in produce
+        self.delivery_stats = {'ok': 0, 'err': 0}
+        self._delivery_lock = Lock()
+        self.producer_configs.setdefault('on_delivery', self._on_delivery)
+        if on_produce is not None:
+            self.on_produce = on_produce
         
         # Create producer
-        self.producer = Producer(self.client_configs)
+        self.producer = Producer(self.producer_configs)
+        
+        # Serve delivery reports periodically in background
+        self.poll_interval = poll_interval
+        self._poll_stop = Event()
+        self._poll_thread = Thread(target=self._poll_loop, daemon=True)
+        self._poll_thread.start()
 
     def produce(self, topic, key=None, value=None):
         """Produce messages"""
         
-        # Produce messages
+        # Produce messages (delivery reports served by poll thread, empty key sent as null)
         try:
-            if key:
-                self.producer.produce(topic=topic,
-                                      key=key,
-                                      value=value,
-                                      callback=self.on_produce)
-            else:
-                self.producer.produce(topic=topic,
-                                      value=value,
-                                      callback=self.on_produce)
+            self.producer.produce(topic, value, key or None)
         except Exception as exc:
             self.handle_exception(exc)
         
-    def on_produce(self, error, message):
-        """Callback on produce"""
+    def produce_batch(self, topic, values, keys=None, buffer_timeout: float = 10.0) -> int:
+        """Produce many messages (pass keys as bytes to skip encoding per call)"""
+        """
+        * Returns count queued, messages from that index on were not produced.
+        * If local queue stays full over buffer_timeout, stops and reports it.
+        """
         
-        # Treat callback on produce
-        if error:
-            print(f'failed message delivery: {error}')
-        else:
-            print(f'on_produce | '
-                  f'produced message | '
-                  f'topic: {message.topic()} | '
-                  f'partition: {message.partition()} | '
-                  f'offset: {message.offset()} | '
-                  f'key: {message.key()} | '
-                  f'value: {message.value()}')
+        # Bind producer method once for the loop (delivery reports served by poll thread only)
+        produce = self.producer.produce
+        if keys is None:
+            keys = repeat(None)
+        
+        # Produce messages, returning count queued
+        count = 0
+        try:
+            for key, value in zip(keys, values):
+                try:
+                    produce(topic, value, key)
+                
+                # If local queue full, wait for poll thread to drain it and retry
+                except BufferError:
+                    deadline = time() + buffer_timeout
+                    while True:
+                        sleep(self.poll_interval)
+                        try:
+                            produce(topic, value, key)
+                            break
+                        except BufferError:
+                            if time() >= deadline:
+                                raise BufferError(f'local queue full over {buffer_timeout}s, '
+                                                  f'messages from index {count} not produced')
+                count += 1
+        except Exception as exc:
+            self.handle_exception(exc)
+        return count
+        
+    def _on_delivery(self, error, message):
+        """Callback on delivery report"""
+        
+        # Count delivery result, then pass to user callback if any
+        # (serialized, as poll thread and flush/poll by caller may serve reports at once)
+        with self._delivery_lock:
+            if error:
+                self.delivery_stats['err'] += 1
+                log.warning('failed message delivery: %s', error)
+            else:
+                self.delivery_stats['ok'] += 1
+            if self.on_produce is not None:
+                self.on_produce(error, message)
+    
+    def _poll_loop(self):
+        """Poll delivery reports until closed"""
+        
+        # Poll in cycle (returns early when reports arrive)
+        while not self._poll_stop.is_set():
+            self.poll(self.poll_interval)
 
     def poll(self, timeout: float = 1.0):
         """Poll messages"""
@@ -82,35 +154,59 @@ class KafkaProducer(KafkaClient):
             self.producer.flush()
         except Exception as exc:
             self.handle_exception(exc)
+    
+    def close(self):
+        """Close producer"""
+        
+        # Stop poll thread, then flush remaining messages
+        self._poll_stop.set()
+        self._poll_thread.join()
+        self.flush()
 
 class KafkaConsumer(KafkaClient):
     """Kafka Consumer"""
     
     def __init__(self, host: str = '127.0.0.1', port: int = 9092,
-                 group_id: str = 'nodi-group', custom_configs: dict = {},
-                 access_list_size: int = 100000):
+                 group_id: str = 'nodi-group', custom_configs: dict = None,
+                 access_list_size: int = 100000,
+                 commit_every: int = 1000, commit_interval: float = 1.0,
+                 prefetch_batches: int = 2):
         super().__init__(host, port)
         
-        # Create consumer configs
-        self.consumer_configs = {'group.id': group_id,}
-        self.consumer_configs.update(self.client_configs)
-        self.consumer_configs.update(custom_configs)
+        # Create consumer configs (offsets stored manually once batch is handed over)
+        self.consumer_configs = {'group.id': group_id,
+                                 'enable.auto.offset.store': False,
+                                 **self.client_configs,
+                                 **(custom_configs or {}),}
         
         # Create consumer
         self.consumer = Consumer(self.consumer_configs)
         
-        # Create admin for some functions
-        self.admin = KafkaAdmin()
+        # Create admin for some functions (on the same broker)
+        self.admin = KafkaAdmin(host, port)
+        
+        # Create access list for external access (size 0 to disable)
+        # deque is a bounded ring in C, append and popleft are thread-safe
+        self.access_list = deque(maxlen=access_list_size) if access_list_size else None
         
-        # Create access list for external access
-        self.access_list = deque(maxlen=access_list_size)
+        # Coalesce commits to once per message count or interval
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self._uncommitted = 0
+        self._last_commit_time = time()
+        
+        # Create bounded batch queue for prefetch
+        self._batch_queue = Queue(maxsize=prefetch_batches)
+        self._prefetch_stop = Event()
+        self._prefetch_thread = None
     
     def subscribe(self, topics: list[str]):
         """Subscribe topics"""
         
         # Subscribe topics
         self.consumer.subscribe(topics=topics,
-                                on_assign=self.on_subscribe)
+                                on_assign=self.on_subscribe,
+                                on_revoke=self.on_revoke)
     
     def on_subscribe(self, consumer, partitions):
         """Callback on subscribe"""
@@ -120,74 +216,199 @@ class KafkaConsumer(KafkaClient):
               f'consumer: {consumer} | '
               f'partitions: {partitions}')
     
+    def on_revoke(self, consumer, partitions):
+        """Callback on revoke (rebalance)"""
+        
+        # Drop prefetched messages of revoked partitions, keeping the rest in order
+        revoked = {(partition.topic, partition.partition) for partition in partitions}
+        batches = []
+        while True:
+            try:
+                batches.append(self._batch_queue.get_nowait())
+            except Empty:
+                break
+        for messages in batches:
+            messages = [message for message in messages
+                        if (message.topic(), message.partition()) not in revoked]
+            if messages:
+                self._batch_queue.put_nowait(messages)
+    
     def unsubscribe(self):
         """Unsubscribe topics"""
         
-        # Unsubscribe all topics
+        # Unsubscribe all topics, then discard prefetched batches
         self.consumer.unsubscribe()
+        self._drain_batches()
     
     def assign(self, topic_partitions_info: list[tuple[str, int]]):
         """Assign topics to consumer""" 
         ...
         
-        topic_partitions = []
-        for topic, partition in topic_partitions_info:
-            topic_partitions.append(TopicPartition(topic, partition))
+        topic_partitions = [TopicPartition(topic, partition)
+                            for topic, partition in topic_partitions_info]
         self.consumer.assign(topic_partitions)
 
-    def consume(self, cycle: float = 0.001):
-        """Consume messages"""
-            
-        # Create commit flag
-        to_commit = False
+    def consume(self, batch_size: int = 500, timeout: float = 1.0):
+        """Consume messages in batches (for high throughput prefer batch_size >= 20)"""
         
         while True:
             
             try:
-        
-                # Poll messages
-                message = self.consumer.poll(timeout=1.0)
                 
-                # If no messages, continue
-                # If messages finished, commit
-                if message is None:
-                    if to_commit:
-                        self.consumer.commit()
-                        to_commit = False
-                    continue
+                # Consume batch of messages (blocks up to timeout when idle)
+                messages = self.consumer.consume(num_messages=batch_size,
+                                                 timeout=timeout)
                 
-                # If error, handle exception
-                if message.error():
-                    if to_commit:
-                        self.consumer.commit()
-                        to_commit = False
-                    self.handle_exception(message.error())
+                # If no messages, commit pending offsets and continue
+                if not messages:
+                    if self._uncommitted:
+                        self.commit()
+                    continue
                 
-                # If messages and no error, treat message and store offsets
-                else:
-                    self.access_list.append(message)
-                    self.on_message(message)
-                    self.consumer.store_offsets(message)
-                    to_commit = True
+                # Treat messages, keep for external access, then store offsets
+                good = self._treat_batch(messages)
+                if good:
+                    if self.access_list is not None:
+                        self.access_list.extend(good)
+                    self._store_batch(good)
                         
             except Exception as exc:
 
                 #self.consumer.close()
                 self.handle_exception(exc)
+    
+    def _treat_batch(self, messages: list) -> list:
+        """Treat consumed batch and return good messages"""
+        
+        # Treat messages
+        good = []
+        for message in messages:
+            
+            # If error, handle exception
+            if message.error():
+                self.handle_exception(message.error())
+                continue
             
-            sleep(cycle)
+            # If no error, treat message
+            good.append(message)
+            self.on_message(message)
+        return good
+    
+    def _store_batch(self, good: list):
+        """Store offsets of batch handed over, committing when due"""
+        
+        # Store offset of last message of each partition
+        last = {}
+        for message in good:
+            last[message.topic(), message.partition()] = message
+        offsets = [TopicPartition(topic, partition, message.offset() + 1)
+                   for (topic, partition), message in last.items()]
+        try:
+            self.consumer.store_offsets(offsets=offsets)
+        except Exception as exc:
+            self.handle_exception(exc)
+            return
+        
+        # Commit if enough messages or time passed since last commit
+        self._uncommitted += len(good)
+        if (self._uncommitted >= self.commit_every
+                or time() - self._last_commit_time >= self.commit_interval):
+            self.commit()
+    
+    def start_prefetch(self, batch_size: int = 500, timeout: float = 1.0):
+        """Start fetching batches in background, to be taken by next_batch"""
+        
+        # Keep next fetch in flight while caller treats current batch
+        self._prefetch_stop.clear()
+        self._prefetch_thread = Thread(target=self._prefetch_loop,
+                                       args=(batch_size, timeout),
+                                       daemon=True)
+        self._prefetch_thread.start()
+    
+    def stop_prefetch(self):
+        """Stop fetching batches in background"""
+        
+        # Stop prefetch thread and discard fetched batches
+        self._prefetch_stop.set()
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join()
+            self._prefetch_thread = None
+        self._drain_batches()
+    
+    def _prefetch_loop(self, batch_size: int, timeout: float):
+        """Fetch batches into bounded queue until stopped"""
+        
+        while not self._prefetch_stop.is_set():
+            
+            # Consume batch of messages (blocks up to timeout when idle)
+            try:
+                messages = self.consumer.consume(num_messages=batch_size,
+                                                 timeout=timeout)
+            except Exception as exc:
+                self.handle_exception(exc)
+                continue
+            if not messages:
+                continue
+            
+            # Put batch, blocking while queue is full (backpressure)
+            while not self._prefetch_stop.is_set():
+                try:
+                    self._batch_queue.put(messages, timeout=timeout)
+                    break
+                except Full:
+                    continue
+    
+    def next_batch(self, timeout: float = None) -> list:
+        """Take next prefetched batch, empty list if none within timeout"""
+        
+        # Get batch, or commit pending offsets while idle
+        try:
+            messages = self._batch_queue.get(timeout=timeout)
+        except Empty:
+            if self._uncommitted:
+                self.commit()
+            return []
+        
+        # Treat batch, store offsets of good messages, then return them
+        try:
+            good = self._treat_batch(messages)
+        except Exception as exc:
+            self.handle_exception(exc)
+            return []
+        if good:
+            self._store_batch(good)
+        return good
+    
+    def _drain_batches(self):
+        """Discard prefetched batches"""
+        
+        # Drop batches fetched for partitions no longer assigned
+        while True:
+            try:
+                self._batch_queue.get_nowait()
+            except Empty:
+                return
     
     def on_message(self, message):
-        """Callback on message"""
+        """Callback on message (override to treat each message)"""
         
-        # Treat callback on message
-        print(f'on_message | '
-              f'consumed message | '
-              f'topic: {message.topic()} | '
-              f'partition: {message.partition()} | '
-              f'offset: {message.offset()} | '
-              f'key: {message.key()} | '
-              f'value: {message.value()}')
+        # Log only if debug enabled, skipping field extraction otherwise
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('on_message | consumed message | topic: %s | partition: %d | offset: %d',
+                      message.topic(), message.partition(), message.offset())
+    
+    def pop_access_list(self, max_count: int = None) -> list:
+        """Pop oldest messages from access list"""
+        
+        # Pop only count present now, so producer side may keep appending
+        access_list = self.access_list
+        if not access_list:
+            return []
+        count = len(access_list)
+        if max_count is not None and max_count < count:
+            count = max_count
+        popleft = access_list.popleft
+        return [popleft() for _ in range(count)]
     
     def store_offsets(self):
         """Store offsets"""
@@ -198,19 +419,25 @@ class KafkaConsumer(KafkaClient):
         except Exception as exc:
             self.handle_exception(exc)
     
-    def commit(self):
+    def commit(self, asynchronous: bool = True):
         """Commit"""
         
         # Commit completion status to broker
         try:
-            self.consumer.commit()
+            self.consumer.commit(asynchronous=asynchronous)
+            self._uncommitted = 0
+            self._last_commit_time = time()
         except Exception as exc:
             self.handle_exception(exc)
         
     def close(self):
         """Close consumer"""
         
-        # Close consumer and commit final offsets
+        # Stop prefetch first (consume in flight blocks closing),
+        # then commit pending offsets synchronously and close consumer
+        self.stop_prefetch()
+        if self._uncommitted:
+            self.commit(asynchronous=False)
         self.consumer.close()
         
     def get_watermark_offsets(self, topic: str, partition: int) -> tuple[int, int]:
@@ -304,13 +531,12 @@ class KafkaAdmin(KafkaClient):
     """Kafka Admin"""
     
     def __init__(self, host: str = '127.0.0.1', port: int = 9092,
-                 custom_configs: dict = {}):
+                 custom_configs: dict = None):
         super().__init__(host, port)
         
         # Create admin configs
-        self.admin_configs = {}
-        self.admin_configs.update(self.client_configs)
-        self.admin_configs.update(custom_configs)
+        self.admin_configs = {**self.client_configs,
+                              **(custom_configs or {}),}
         self.admin = AdminClient(self.admin_configs)
     
     def list_groups(self):
@@ -325,22 +551,21 @@ class KafkaAdmin(KafkaClient):
             return False
     
     def create_topics(self, topics: list[str], partition_number: int = 1,
-                      replication_factor: int = 1):
+                      replication_factor: int = 1, operation_timeout: float = 0):
         """Create topics"""
         
         results = []
         
         # Get new topic objects
-        new_topics = []
-        for topic in topics:
-            topic_new = NewTopic(topic=topic,
-                                 num_partitions=partition_number,
-                                 replication_factor=replication_factor)
-            new_topics.append(topic_new)
+        new_topics = [NewTopic(topic=topic,
+                               num_partitions=partition_number,
+                               replication_factor=replication_factor)
+                      for topic in topics]
         
         # Create topics
         if new_topics:
-            futures_dict = self.admin.create_topics(new_topics)
+            futures_dict = self.admin.create_topics(new_topics,
+                                                    operation_timeout=operation_timeout)
             
             # Check async results
             for topic, future in futures_dict.items():
@@ -364,11 +589,12 @@ class KafkaAdmin(KafkaClient):
             self.handle_exception(exc)
             return False
 
-    def delete_topics(self, topics: list[str]):
+    def delete_topics(self, topics: list[str], operation_timeout: float = 0):
         """Delete topics"""
         
-        # Delete topics
-        futures_dict = self.admin.delete_topics(topics)
+        # Delete topics (with operation timeout, broker waits until done)
+        futures_dict = self.admin.delete_topics(topics,
+                                                operation_timeout=operation_timeout)
         
         # Check async results
         results = []
@@ -387,7 +613,7 @@ class KafkaAdmin(KafkaClient):
         
         # Create list to record topic creations
         deleted = []
-        to_create = topics[:]
+        to_create = dict.fromkeys(topics)
         created = []
         
         try:
@@ -395,20 +621,23 @@ class KafkaAdmin(KafkaClient):
             # Check start time
             time_start = time()
             
-            # Delete all topics first
-            deleted.extend(self.delete_topics(topics))
+            # Delete all topics first, resolving once deletion completes on broker
+            deleted.extend(self.delete_topics(topics, operation_timeout=timeout))
             if not deleted:
                 return False
             
-            # Then loop to create topics
+            # Then loop to create topics (retried only if still being deleted)
             while True:
                 
-                # Create topics
-                just_created = self.create_topics(topics=to_create,
+                # Create topics, resolving once creation completes on broker
+                time_remaining = max(timeout - (time() - time_start), 0)
+                just_created = self.create_topics(topics=list(to_create),
                                                   partition_number=partition_number,
-                                                  replication_factor=replication_factor)
+                                                  replication_factor=replication_factor,
+                                                  operation_timeout=time_remaining)
                 created.extend(just_created)
-                to_create = list(set(to_create) - set(just_created))
+                for topic in just_created:
+                    to_create.pop(topic, None)
                 
                 # If all topics created, break loop
                 if not to_create:
@@ -419,8 +648,8 @@ class KafkaAdmin(KafkaClient):
                 if time_elapsed >= timeout:
                     raise TimeoutError
                     
-                # Wait for next check
-                sleep(check_interval)
+                # Wait for next check, not beyond timeout
+                sleep(min(check_interval, timeout - time_elapsed))
 
         except Exception as exc:
             self.handle_exception(exc)
@@ -481,15 +710,14 @@ class KafkaAdmin(KafkaClient):
     def get_topics_config(self, topics: list[str]):
         """Get config from topics"""
         try:
-            resources = []
-            for topic in topics:
-                resource = ConfigResource('topic', topic)
-                resources.append(resource)
+            resources = [ConfigResource('topic', topic) for topic in topics]
             futures = self.admin.describe_configs(resources)
-            results = {}
-            for resource, future in futures.items():
-                topic = resource.name
-                results[topic] = {}
+            
+            # Treat results as each completes, keeping topic order
+            results = {resource.name: {} for resource in futures}
+            topics_by_future = {future: resource.name for resource, future in futures.items()}
+            for future in as_completed(topics_by_future):
+                topic = topics_by_future[future]
                 configs = future.result()
                 for config, entry in configs.items():
                     results[topic][config] = entry.value
@@ -620,10 +848,6 @@ if __name__ == '__main__':
     if sys.argv[1] == 'p':
         p = KafkaProducer()
 
-        # mask produce callback
-        def on_produce(error, message): ...
-        p.on_produce = on_produce
-
         d = {}
         t = get_current_timestamp()
         for i in range(10000):
@@ -633,13 +857,13 @@ if __name__ == '__main__':
         check = time()
         pkl = dumps(d)
         print(time() - check)
-        # for i in range(10000):
-        #     p.produce(topic='test-topic1', key='test-key', value=f'Hello Kafka {i}')
+        # values = [f'Hello Kafka {i}'.encode() for i in range(10000)]
+        # p.produce_batch(topic='test-topic1', values=values, keys=repeat(b'test-key'))
         check = time()
-        for i in range(100):
-            p.produce(topic='test-topic1', key=None, value=pkl)
+        p.produce_batch(topic='test-topic1', values=repeat(pkl, 100))
         print(time() - check)
-        p.flush()
+        p.close()
+        print(p.delivery_stats)
         
     if sys.argv[1] == 'c':
         c = KafkaConsumer(group_id='test-group3', custom_configs=custom_configs)
@@ -647,10 +871,6 @@ if __name__ == '__main__':
         c.subscribe(['test-topic', 'test-topic1', 'test-topic2'])
         lo, hi = c.get_watermark_offsets('test-topic1', 0)
         c.seek_to_offset('test-topic1', 0, hi-10)
-
-        # mask message callback
-        def on_message(message): ...
-        c.on_message = on_message
         
         # topics = []
         # for i in range(3000):
@@ -666,11 +886,8 @@ if __name__ == '__main__':
         t.start()
 
         while True:
-            cnt = 0
-            while c.access_list:
-                message = c.access_list.popleft()
-                cnt += 1
-            print(cnt)
+            messages = c.pop_access_list()
+            print(len(messages))
             sleep(1)
 
     if sys.argv[1] == 'a':
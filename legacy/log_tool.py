@@ -1,4 +1,15 @@
 from datetime import datetime
+from time import time_ns
+
+# Two digit strings for fixed width time formatting
+_DIGITS = [f'{i:02d}' for i in range(100)]
+
+LEVELS = ('INFO', 'DEBUG', 'WARNING', 'ERROR', 'CRITICAL')
+
+def _format_second(now):
+    """Format as '%Y-%m-%d %H:%M:%S' without strftime"""
+    return (f'{_DIGITS[now.year // 100]}{_DIGITS[now.year % 100]}-{_DIGITS[now.month]}-{_DIGITS[now.day]} '
+            f'{_DIGITS[now.hour]}:{_DIGITS[now.minute]}:{_DIGITS[now.second]}')
 
 class Logger:
     """Logger"""
@@ -7,6 +18,12 @@ class Logger:
         self.path = path
         self.name = name
         self.encoding = encoding
+        
+        # Cache per second to format time and resolve path once a second
+        self._second = None
+        self._second_text = None
+        self._file_path = None
+        self._file = None
     
     def info(self, message, to_print=False):
         self.logging('INFO', message, to_print)
@@ -25,19 +42,50 @@ class Logger:
         
     def logging(self, level, message, to_print):
 
-        # Get current time
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S, %f')
+        # Get current time once for both message and file path
+        second, nanosecond = divmod(time_ns(), 1000000000)
+        if second != self._second:
+            
+            # If file path changed (e.g. date rollover), reopen file
+            now = datetime.fromtimestamp(second)
+            file_path = now.strftime(self.path)
+            if file_path != self._file_path:
+                self.close()
+                self._file = open(file=file_path,
+                                  mode='a',
+                                  encoding=self.encoding,
+                                  buffering=1)
+                self._file_path = file_path
+            self._second = second
+            self._second_text = _format_second(now)
         
-        # Format message
-        full_message = f'[{current_time}][{self.name}][{level}] {message}\n'
+        # Format message with prebuilt prefix of level
+        prefix = self._prefixes.get(level) or f'][{self._name}][{level}] '
+        full_message = f'[{self._second_text}, {nanosecond // 1000:06d}{prefix}{message}\n'
 
         # to_print on console
         if to_print:
             print(full_message)
         
-        # Write to file
-        file_path = datetime.now().strftime(self.path)
-        with open(file=file_path,
-                  mode='a',
-                  encoding=self.encoding) as file:
-            file.write(full_message)
\ No newline at end of file
+        # Write to file kept open (line buffered, flushed per line)
+        self._file.write(full_message)
+    
+    def close(self):
+        
+        # Close file if opened (reopened on next logging)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._file_path = None
+            self._second = None
+    
+    @property
+    def name(self):
+        return self._name
+    
+    @name.setter
+    def name(self, value):
+        self._name = value
+        
+        # Prebuild '][name][LEVEL] ' following time for each level
+        self._prefixes = {level: f'][{value}][{level}] ' for level in LEVELS}
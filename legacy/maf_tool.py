@@ -1,11 +1,17 @@
+from collections import deque
+
 class QueueMaf:
     """Queue Moving Average Filter"""
 
     def __init__(self, size=1, decimal=6):
         self._size = max(size, 1)
         self.decimal = decimal
-        self.queue = []
+        self.queue = deque(maxlen=self._size)
         self.mean = 0
+        
+        # Running sum, rescanned once per window to cancel float drift
+        self._sum = 0
+        self._updates = 0
 
     @property
     def size(self):
@@ -14,18 +20,30 @@ class QueueMaf:
     @size.setter
     def size(self, value):
         self._size = max(value, 1)
-        if len(self.queue) > self._size:
-            self.queue = self.queue[-self._size:]
+        self.queue = deque(self.queue, maxlen=self._size)
+        self._sum = sum(self.queue)
+        self._updates = 0
 
     def add_sample(self, sample):
         self.sample = sample
-        self.queue.append(self.sample)
-        if len(self.queue) > self._size:
-            self.queue.pop(0)
-        self.mean = round(sum(self.queue) / len(self.queue), self.decimal)
+        
+        # Drop oldest sample from sum when window is full
+        queue = self.queue
+        if len(queue) == self._size:
+            self._sum -= queue[0]
+        queue.append(sample)
+        
+        # Update sum by new sample, rescanning once per window
+        self._updates += 1
+        if self._updates >= self._size:
+            self._sum = sum(queue)
+            self._updates = 0
+        else:
+            self._sum += sample
+        self.mean = round(self._sum / len(queue), self.decimal)
         
 class TickMaf:
-    """Tick Moving Average Filter"""
+    """Tick Moving Average Filter (cumulative mean until size samples, then EWMA of alpha 1/size)"""
 
     def __init__(self, size=1, decimal=6):
         self.size = max(size, 1)
@@ -34,14 +52,27 @@ class TickMaf:
         self.count = 0
         self.mean = 0
     
+    @property
+    def size(self):
+        return self._size
+
+    @size.setter
+    def size(self, value):
+        self._size = max(value, 1)
+        
+        # Precompute factors so full window update needs no division
+        self._keep = (self._size - 1) / self._size
+        self._inv_size = 1 / self._size
+    
     def add_sample(self, sample):
         self.sample = sample
-        if self.count < self.size:
+        if self.count < self._size:
             self.sum = self.sum + self.sample
             self.count += 1
+            self.mean = round(self.sum / self.count, self.decimal)
         else:
-            self.sum = self.sum / self.size * (self.size - 1) + self.sample
-        self.mean = round(self.sum / self.count, self.decimal)
+            self.sum = self.sum * self._keep + self.sample
+            self.mean = round(self.sum * self._inv_size, self.decimal)
          
 if __name__ == '__main__':
     taf = TickMaf(10)
@@ -13,9 +13,15 @@ from pymodbus.server.base import ModbusBaseServer
 from pymodbus.device import ModbusDeviceIdentification
 from pymodbus import __version__ as package_version
 import asyncio
-from threading import Thread
+from collections import OrderedDict
+from math import isfinite
+from threading import Event, Thread
+from typing import Sequence
 from pkg.datatype_tool import *
 
+# Full address space zeros, copied once per datablock
+FULL_REGISTER_ZEROS = (0x00,) * 65536
+
 class ModbusServer:
     """Modbus Server"""
 
@@ -65,7 +71,7 @@ class ModbusServer:
         # Define get_datablock method
         def get_datablock(unit_id: int, register: int):
             if register_type == 'full':
-                datablock = ModbusSequentialDataBlock.create()
+                datablock = ModbusSequentialDataBlock(0x00, FULL_REGISTER_ZEROS)
             elif register_type == 'range':
                 datablock = ModbusSequentialDataBlock(
                     address=register_kwargs[unit_id][register][0],
@@ -113,6 +119,7 @@ class ModbusServer:
                 
             # Create is_single
             self.is_single = False
+            self._single_storage = None
         
         # If no unit IDs configured
         else:
@@ -130,13 +137,19 @@ class ModbusServer:
                                                ir=self.storage[unit_id][3],
                                                hr=self.storage[unit_id][4])
                 
-            # Create is_single
+            # Create is_single, keeping single unit datablocks at hand
             self.is_single = True
+            self._single_storage = self.storage[unit_id]
     
         # Create server context
         self.server_context = ModbusServerContext(slaves=slave_context,
                                                   single=self.is_single)
 
+        # Event loop of running server (created per start, closed by its thread)
+        self._loop = None
+        self._loop_thread = None
+        self._loop_started = Event()
+
         # Set server
         if comm_type == 'tcp':
             self.start_method = StartAsyncTcpServer
@@ -166,22 +179,48 @@ class ModbusServer:
     
     def start_server_fore(self):
         """Start server in foreground"""
-        async def _start_server():
-            await self.start_method(**self.start_kwargs)
-        asyncio.run(_start_server())
+        
+        # Run server on fresh loop, closed here by the thread running it
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        asyncio.set_event_loop(loop)
+        try:
+            loop.call_soon(self._loop_started.set)
+            loop.run_until_complete(self.start_method(**self.start_kwargs))
+        finally:
+            self._loop = None
+            asyncio.set_event_loop(None)
+            loop.close()
         
     def start_server_back(self):
         """Start server in background"""
-        loop_thread = Thread(target=self.start_server_fore)
-        loop_thread.daemon = True
-        loop_thread.start()
+        self._loop_started.clear()
+        self._loop_thread = Thread(target=self.start_server_fore)
+        self._loop_thread.daemon = True
+        self._loop_thread.start()
     
     def stop_server(self):
         """Stop server"""
-        async def _stop_server():
-            await ServerAsyncStop()
-        asyncio.run(_stop_server())
+        
+        # If background server starting, wait until its loop runs (or thread ends)
+        loop_thread = self._loop_thread
+        if loop_thread is not None:
+            while not self._loop_started.wait(0.1) and loop_thread.is_alive():
+                pass
+        
+        # If server loop running, stop server on it, otherwise stop on own loop
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(ServerAsyncStop(), loop).result()
+        else:
+            asyncio.run(ServerAsyncStop())
+        
+        # Wait for background server to return (its thread closes loop)
+        if loop_thread is not None:
+            loop_thread.join()
+            self._loop_thread = None
         del self.storage
+        self._single_storage = None
     
     def get_server(self):
         return ModbusBaseServer.active_server
@@ -194,12 +233,20 @@ class ModbusServer:
                    unit_id: int,
                    register: int,
                    location: int,
-                   values: list[int]):
-        """Set values to server"""
-        if self.is_single: unit_id = 0
-        storage: ModbusSlaveContext = self.storage[unit_id][register]
-        storage.setValues(address=location,
-                          values=values)
+                   values: Sequence[int]):
+        """Set values to server (any word sequence, e.g. array('H'))"""
+        if self.is_single:
+            storage = self._single_storage[register]
+        else:
+            storage = self.storage[unit_id][register]
+        
+        # If sequential block, assign slice of its contiguous list directly
+        if type(storage) is ModbusSequentialDataBlock:
+            start = location - storage.address
+            storage.values[start:start + len(values)] = values
+        else:
+            storage.setValues(address=location,
+                              values=values if type(values) is list else list(values))
     
     def get_values(self,
                    unit_id: int,
@@ -207,11 +254,31 @@ class ModbusServer:
                    location: int,
                    length: int) -> list[int]:
         """Get values from server"""
-        if self.is_single: unit_id = 0
-        storage: ModbusSlaveContext = self.storage[unit_id][register]
+        if self.is_single:
+            storage = self._single_storage[register]
+        else:
+            storage = self.storage[unit_id][register]
+        
+        # If sequential block, slice its contiguous list directly
+        if type(storage) is ModbusSequentialDataBlock:
+            start = location - storage.address
+            return storage.values[start:start + length]
         result = storage.getValues(address=location,
                                    count=length)
         return result
+    
+    def get_values_raw(self,
+                       unit_id: int,
+                       register: int) -> tuple[list[int], int]:
+        """Get backing values list of sequential datablock and its location, without copy"""
+        """pass both to ModbusTools.decode_values as input_words and location"""
+        if self.is_single:
+            storage = self._single_storage[register]
+        else:
+            storage = self.storage[unit_id][register]
+        if type(storage) is not ModbusSequentialDataBlock:
+            raise TypeError('register type has no contiguous values')
+        return storage.values, storage.address
 
 from pymodbus.client.tcp import ModbusTcpClient as _ModbusTcpClient
 
@@ -262,6 +329,12 @@ class ModbusTcpClient:
                               6: None,
                               15: 800,
                               16: 100}
+        
+        # Define dispatch dict as {function_code: (custom, modbus, block size)}
+        self._dispatch = {function_code: (self.custom_function_md[function_code],
+                                          self.modbus_function_md[function_code],
+                                          self.block_size_md[function_code])
+                          for function_code in self.custom_function_md}
     
     def connect(self):
         """Connect to server"""
@@ -284,9 +357,7 @@ class ModbusTcpClient:
         """Read with any function code"""
 
         # Interpret arguments
-        custom_function = self.custom_function_md[function_code]
-        modbus_function = self.modbus_function_md[function_code]
-        block_size = self.block_size_md[function_code]
+        custom_function, modbus_function, block_size = self._dispatch[function_code]
 
         # Execute function and get result
         result = custom_function(unit_id=unit_id,
@@ -304,9 +375,7 @@ class ModbusTcpClient:
         """Write with any function code"""
 
         # Interpret arguments
-        custom_function = self.custom_function_md[function_code]
-        modbus_function = self.modbus_function_md[function_code]
-        block_size = self.block_size_md[function_code]
+        custom_function, modbus_function, block_size = self._dispatch[function_code]
 
         # Execute function and get result
         result = custom_function(unit_id=unit_id,
@@ -319,20 +388,36 @@ class ModbusTcpClient:
     def _read_bits(self, unit_id, function, location, length, block_size):
         """Read bits for function code 01/02"""
 
+        # If fits in one block, read once and trim padding bits
+        if 0 < length <= block_size:
+            return function(address=location,
+                            count=length,
+                            slave=unit_id).bits[:length]
+        
         # Read numbers over maximum block size
         result = []
+        result_extend = result.extend
         number_reserve = length
         while length > 0:
-            result += function(address=location,
-                               count=min(block_size, length),
-                               slave=unit_id).bits
+            result_extend(function(address=location,
+                                   count=min(block_size, length),
+                                   slave=unit_id).bits)
             location += block_size
             length -= block_size
-        return result[0:number_reserve]
+        
+        # Trim padding bits of last byte in place
+        del result[number_reserve:]
+        return result
     
     def _read_words(self, unit_id, function, location, length, block_size):
         """Read words for function code 03/04"""
 
+        # If fits in one block, read once
+        if 0 < length <= block_size:
+            return function(address=location,
+                            count=length,
+                            slave=unit_id).registers
+        
         # Read numbers over maximum block size
         result = []
         while length > 0:
@@ -355,100 +440,228 @@ class ModbusTcpClient:
     def _write_many(self, unit_id, function, location, data_list, block_size):
         """Write bits/words for function 15/16"""
 
-        # Write numbers over maximum block size
-        data_cp = data_list[:]
-        while len(data_cp) > 0:
+        # Write numbers over maximum block size, slicing by cursor
+        result = None
+        for start in range(0, len(data_list), block_size):
             result = function(address=location,
-                              values=data_cp[0:min(block_size,len(data_cp))],
+                              values=data_list[start:start + block_size],
                               slave=unit_id)
             location += block_size
-            del data_cp[0:block_size]
         return result
 
+# Bit words by bit position
+_BIT_WORDS = {position: 1 << position for position in range(16)}
+
 class ModbusTools:
 
-    """Datatype conversion map"""
+    """Datatype conversion map as {datatype: (size, get, set)}"""
     DATATYPE_CONV_MAP = {
-        ''        : {'size': 1,
-                     'get': word1_to_int16,
-                     'set': int16_to_word1,},
-        'word'    : {'size': 1,
-                     'get': word1_to_int16,
-                     'set': int16_to_word1,},
-        'uint16'  : {'size': 1,
-                     'get': word1_to_uint16,
-                     'set': uint16_to_word1,},
-        'int16'   : {'size': 1,
-                     'get': word1_to_int16,
-                     'set': int16_to_word1,},
-        'uint32'  : {'size': 2,
-                     'get': word2_to_uint32,
-                     'set': uint32_to_word2,},
-        'uint32r' : {'size': 2,
-                     'get': word2_to_uint32_reversed,
-                     'set': uint32_to_word2_reversed,},
-        'int32'   : {'size': 2,
-                     'get': word2_to_int32,
-                     'set': int32_to_word2,},
-        'int32r'  : {'size': 2,
-                     'get': word2_to_int32_reversed,
-                     'set': int32_to_word2_reversed,},
-        'uint64'  : {'size': 4,
-                     'get': word4_to_uint64,
-                     'set': uint64_to_word4,},
-        'int64'   : {'size': 4,
-                     'get': word4_to_int64,
-                     'set': int64_to_word4,},
-        'float32' : {'size': 2,
-                     'get': word2_to_float32,
-                     'set': float32_to_word2,},
-        'float32r': {'size': 2,
-                     'get': word2_to_float32_reversed,
-                     'set': float32_to_word2_reversed,},
-        'float64' : {'size': 4,
-                     'get': word4_to_float64,
-                     'set': float64_to_word4,},
-        'fixed32' : {'size': 2,
-                     'get': word2_to_fixed32,
-                     'set': fixed32_to_word2,},
-        'fixed32r': {'size': 2,
-                     'get': word2_to_fixed32_reversed,
-                     'set': fixed32_to_word2_reversed,},
-        'fixed64' : {'size': 4,
-                     'get': word4_to_fixed64,
-                     'set': fixed64_to_word4,},
-        'char2'   : {'size': 1,
-                     'get': word1_to_char2,
-                     'set': char2_to_word1,},
-        'bit'     : {'size': 1,
-                     'get': word1_to_bit,
-                     'set': bit_to_word1,},}
+        ''        : (1, word1_to_int16,             int16_to_word1),
+        'word'    : (1, word1_to_int16,             int16_to_word1),
+        'uint16'  : (1, word1_to_uint16,            uint16_to_word1),
+        'int16'   : (1, word1_to_int16,             int16_to_word1),
+        'uint32'  : (2, word2_to_uint32,            uint32_to_word2),
+        'uint32r' : (2, word2_to_uint32_reversed,   uint32_to_word2_reversed),
+        'int32'   : (2, word2_to_int32,             int32_to_word2),
+        'int32r'  : (2, word2_to_int32_reversed,    int32_to_word2_reversed),
+        'uint64'  : (4, word4_to_uint64,            uint64_to_word4),
+        'int64'   : (4, word4_to_int64,             int64_to_word4),
+        'float32' : (2, word2_to_float32,           float32_to_word2),
+        'float32r': (2, word2_to_float32_reversed,  float32_to_word2_reversed),
+        'float64' : (4, word4_to_float64,           float64_to_word4),
+        'fixed32' : (2, word2_to_fixed32,           fixed32_to_word2),
+        'fixed32r': (2, word2_to_fixed32_reversed,  fixed32_to_word2_reversed),
+        'fixed64' : (4, word4_to_fixed64,           fixed64_to_word4),
+        'char2'   : (1, word1_to_char2,             char2_to_word1),
+        'bit'     : (1, word1_to_bit,               bit_to_word1)}
+    
+    """Batch decoders for datatypes decoded together in one struct call"""
+    DATATYPE_BATCH_MAP = {
+        'float32' : word2_to_float32_batch,
+        'float32r': word2_to_float32_reversed_batch,
+        'float64' : word4_to_float64_batch,}
+    
+    """Compiled decoders caches by map values and by map lists, least recently used evicted"""
+    DECODER_CACHE_SIZE = 4096
+    _decoder_cache = OrderedDict()
+    _plan_by_identity = OrderedDict()
+    
+    def compile_plan(self,
+                     location: int,
+                     addresses: list[int],
+                     datatypes: list[str],
+                     masks: list[int | float],
+                     float_decimal: int = 3):
+        """Generate decoder specialized to register map, as (decoder, words_needed)"""
+        
+        # If same map lists as before and unchanged, reuse plan without building key of values
+        identity_key = (type(self), location, id(addresses), id(datatypes), id(masks), float_decimal)
+        entry = self._plan_by_identity.get(identity_key)
+        if (entry is not None and entry[1] == addresses and entry[2] == datatypes
+                and entry[3] == masks):
+            self._touch(self._plan_by_identity, identity_key)
+            return entry[0]
+        
+        # Get plan by map values, keeping map lists referenced so their ids stay valid
+        plan = self._compile_plan_by_value(location, addresses, datatypes, masks, float_decimal)
+        self._cache_put(self._plan_by_identity, identity_key,
+                        (plan, addresses[:], datatypes[:], masks[:], addresses, datatypes, masks))
+        return plan
+    
+    def _compile_plan_by_value(self, location, addresses, datatypes, masks, float_decimal):
+        """Get decoder of register map from cache by its values, compiling if missing"""
+        
+        # If already compiled (or found not compilable) for same map, reuse it
+        key = (type(self), location, tuple(addresses), tuple(datatypes),
+               tuple(masks), float_decimal)
+        plan = self._decoder_cache.get(key, key)
+        if plan is not key:
+            self._touch(self._decoder_cache, key)
+            return plan
+        
+        # Validate all datatypes at once, before building anything
+        unknown_datatypes = set(datatypes).difference(self.DATATYPE_CONV_MAP)
+        if unknown_datatypes:
+            raise KeyError(f'unknown datatypes: {sorted(unknown_datatypes)}')
+        
+        # Build one expression per config, indexing words directly
+        namespace = {'round': round, 'int': int}
+        batch_groups = {}
+        expressions = []
+        words_needed = 0
+        for index, (address, datatype, mask) in enumerate(zip(addresses, datatypes, masks)):
+            words_size, conversion_function, _ = self.DATATYPE_CONV_MAP[datatype]
+            start_address = address - location
+            
+            # If start before input words, not compilable (slicing differs from indexing)
+            if start_address < 0:
+                self._cache_plan(key, None)
+                return None
+            words_needed = max(words_needed, start_address + words_size)
+            args = ', '.join(f'w[{i}]' for i in range(start_address, start_address + words_size))
+            
+            # Put mask as literal if exactly representable, otherwise as name
+            if mask is None or type(mask) in (int, bool) or (type(mask) is float
+                                                             and isfinite(mask)):
+                mask_code = repr(mask)
+            else:
+                mask_code = f'_m{index}'
+                namespace[mask_code] = mask
+            
+            # If datatype decodable in batch, gather words to decode at once,
+            # merging contiguous words into one slice as [count, [[start, end], ...]]
+            if datatype in self.DATATYPE_BATCH_MAP:
+                group = batch_groups.setdefault(datatype, [0, []])
+                value_code = f'_b{datatype}[{group[0]}]'
+                group[0] += 1
+                runs = group[1]
+                if runs and runs[-1][1] == start_address:
+                    runs[-1][1] = start_address + words_size
+                else:
+                    runs.append([start_address, start_address + words_size])
+            else:
+                namespace[conversion_function.__name__] = conversion_function
+                value_code = f'{conversion_function.__name__}({args}'
+                value_code += f', {mask_code})' if datatype == 'bit' else ')'
+            
+            # Apply mask same way as generic decoding
+            if datatype == 'bit':
+                expressions.append(f'int({value_code})')
+            elif mask:
+                expressions.append(f'round({value_code} * {mask_code}, {float_decimal})')
+            else:
+                expressions.append(value_code)
+        
+        # Generate source of decoder
+        lines = ['def _decoder(w, out=None):']
+        for datatype, (_, runs) in batch_groups.items():
+            batch_function = self.DATATYPE_BATCH_MAP[datatype]
+            namespace[batch_function.__name__] = batch_function
+            if len(runs) == 1:
+                words_code = f'w[{runs[0][0]}:{runs[0][1]}]'
+            else:
+                words_code = '[' + ', '.join(f'*w[{start}:{end}]' for start, end in runs) + ']'
+            lines.append(f'    _b{datatype} = {batch_function.__name__}({words_code})')
+        values_code = ', '.join(expressions)
+        lines.append('    if out is None:')
+        lines.append(f'        return [{values_code}]')
+        lines.append(f'    out[:] = ({values_code}{"," if expressions else ""})')
+        lines.append('    return out')
+        
+        # Compile decoder and cache it
+        exec(compile('\n'.join(lines), '<modbus decoder>', 'exec'), namespace)
+        plan = (namespace['_decoder'], words_needed)
+        self._cache_plan(key, plan)
+        return plan
+    
+    def _cache_plan(self, key, plan):
+        """Cache compiled plan by map values"""
+        self._cache_put(self._decoder_cache, key, plan)
+    
+    def _cache_put(self, cache, key, value):
+        """Put into cache, evicting least recently used entries when full"""
+        cache[key] = value
+        while len(cache) > self.DECODER_CACHE_SIZE:
+            try:
+                cache.popitem(last=False)
+            except KeyError:
+                break
+    
+    def _touch(self, cache, key):
+        """Mark cache entry as recently used (entry may be evicted by other thread)"""
+        try:
+            cache.move_to_end(key)
+        except KeyError:
+            pass
     
     def decode_values(self,
-                      input_words: list[int],
+                      input_words: Sequence[int],
                       location: int,
                       addresses: list[int],
                       datatypes: list[str],
                       masks: list[int | float],
-                      float_decimal: int = 3) -> list[int | float | str]:
-        """Convert Modbus words to decoded values"""
+                      float_decimal: int = 3,
+                      out: list = None) -> list[int | float | str]:
+        """Convert Modbus words to decoded values (into out list if given, reused across polls)"""
+        
+        # If compiled decoder covers input words, decode with it
+        plan = self.compile_plan(location, addresses, datatypes, masks, float_decimal)
+        if plan is not None and len(input_words) >= plan[1]:
+            return plan[0](input_words, out)
         
         # Create output values list
         output_values = []
+        
+        # Create batch groups as {datatype: (indices, masks, words)}
+        batch_groups = {}
+        
+        # Bind maps to locals for the loop
+        conv_map = self.DATATYPE_CONV_MAP
+        batch_map = self.DATATYPE_BATCH_MAP
 
         # Iterate configs
         for address, datatype, mask in zip(addresses, datatypes, masks):
             
+            # Get words size and conversion function
+            words_size, conversion_function, _ = conv_map[datatype]
+            
             # Get relative start address and end address
             start_address = address - location
-            words_size = self.DATATYPE_CONV_MAP[datatype]['size']
             end_address = start_address + words_size
 
-            # Get conversion function
-            conversion_function = self.DATATYPE_CONV_MAP[datatype]['get']
-
             # Get conversion target words list
             target_words = input_words[start_address:end_address]
+            
+            # If datatype decodable in batch, gather words to decode later
+            if datatype in batch_map and len(target_words) == words_size:
+                group = batch_groups.get(datatype)
+                if group is None:
+                    group = batch_groups[datatype] = ([], [], [])
+                group[0].append(len(output_values))
+                group[1].append(mask)
+                group[2].extend(target_words)
+                output_values.append(None)
+                continue
 
             # If datatype is bit, convert with mask
             if datatype == 'bit':
@@ -467,7 +680,18 @@ class ModbusTools:
             # Append to output values list
             output_values.append(output_value)
         
-        # Return result
+        # Decode each batch group at once, then place by index with mask
+        for datatype, (indices, group_masks, group_words) in batch_groups.items():
+            decoded = batch_map[datatype](group_words)
+            for index, mask, output_value in zip(indices, group_masks, decoded):
+                if mask:
+                    output_value = round(output_value * mask, float_decimal)
+                output_values[index] = output_value
+        
+        # Return result, in out list if given
+        if out is not None:
+            out[:] = output_values
+            return out
         return output_values
 
     def encode_values(self,
@@ -480,25 +704,38 @@ class ModbusTools:
         """Convert encoded values to Modbus words"""
 
         # Create output words list filled with zero 
-        output_words = [0 for _ in range(length)]
+        output_words = [0] * length
+
+        # Bind map to local for the loop
+        conv_map = self.DATATYPE_CONV_MAP
+        
+        # Create bit words cumulated per address, added to output at the end
+        bit_words = {}
 
         # Iterate configs
         for value, address, datatype, mask in zip(input_values, addresses, datatypes, masks):
             
+            # Get words size and conversion function
+            words_size, _, conversion_function = conv_map[datatype]
+            
             # Get relative start address and end address
             start_address = address - location
-            words_size = self.DATATYPE_CONV_MAP[datatype]['size']
             end_address = start_address + words_size
 
-            # Get conversion function
-            conversion_function = self.DATATYPE_CONV_MAP[datatype]['set']
-
-            # If datatype is bit, convert and cumulate
+            # If datatype is bit, cumulate per address
             if datatype == 'bit':
-                if value == 'True' or value == True or value >= 1:
-                    output_word = conversion_function(True, mask)
-                    output_words[start_address] += output_word
+                # True/'True' or number >= 1 sets bit (True >= 1 already)
+                if (value == 'True') if type(value) is str else (value >= 1):
+                    output_word = _BIT_WORDS.get(mask)
+                    if output_word is None:
+                        output_word = conversion_function(True, mask)
+                    bit_words[start_address] = bit_words.get(start_address, 0) + output_word
             else:
+                
+                # If bits cumulated on words to overwrite, drop them
+                if bit_words:
+                    for bit_address in range(start_address, end_address):
+                        bit_words.pop(bit_address, None)
 
                 # If mask exists, divide by mask
                 if mask:
@@ -510,11 +747,14 @@ class ModbusTools:
                 # If datatype is not bit, convert
                 output_word = conversion_function(value)
 
-                # Convert result to list then append to output words list
-                if isinstance(output_word, tuple):
-                    output_words[start_address:end_address] = output_word
-                else:
-                    output_words[start_address:end_address] = [output_word]
+                # Put result to output words list (single word as 1-tuple)
+                if type(output_word) is not tuple:
+                    output_word = (output_word,)
+                output_words[start_address:end_address] = output_word
+        
+        # Add cumulated bit words
+        for start_address, output_word in bit_words.items():
+            output_words[start_address] += output_word
         
         # Return result
         return output_words
@@ -1,6 +1,13 @@
-from collections import deque
+from collections import deque, namedtuple
+from sys import intern
+import logging
 import paho.mqtt.client as mqtt
 
+log = logging.getLogger('mosquitto')
+
+# Received message kept as topic and raw payload only
+MosquittoMessage = namedtuple('MosquittoMessage', ['topic', 'payload'])
+
 class MosquittoClient:
     """Mosquitto MQTT Client"""
 
@@ -26,11 +33,12 @@ class MosquittoClient:
             self.client.username_pw_set(username=self.username,
                                         password=self.password)
         
-        # Set callbacks
-        self.client.on_connect = self._on_connect
-        self.client.on_connect_fail = self._on_connect_fail
-        self.client.on_disconnect = self._on_disconnect
-        self.client.on_log = self._on_log
+        # Set callbacks (debug logging only, so not called at all unless debug)
+        if self.debug:
+            self.client.on_connect = self._on_connect
+            self.client.on_connect_fail = self._on_connect_fail
+            self.client.on_disconnect = self._on_disconnect
+            self.client.on_log = self._on_log
         
         # Set other options
         self.client.max_queued_messages_set(queue_size=self.message_qt)
@@ -77,38 +85,23 @@ class MosquittoClient:
     
     def _on_connect(self, client, userdata, flags, rc):
         """Callback on connect success"""
-        if self.debug:
-            print(f'on_connect | '
-                  f'client: {client} | '
-                  f'userdata: {userdata} | '
-                  f'flags: {flags} | '
-                  f'rc: {rc}')
+        log.debug('on_connect | client: %s | userdata: %s | flags: %s | rc: %s',
+                  client, userdata, flags, rc)
     
     def _on_connect_fail(self, client, userdata, flags, rc):
         """Callback on connect failure"""
-        if self.debug:
-            print(f'on_connect_fail | '
-                  f'client: {client} | '
-                  f'userdata: {userdata} | '
-                  f'flags: {flags} | '
-                  f'rc: {rc}')
+        log.debug('on_connect_fail | client: %s | userdata: %s | flags: %s | rc: %s',
+                  client, userdata, flags, rc)
 
     def _on_disconnect(self, client, userdata, rc):
         """Callback on disconnect"""
-        if self.debug:
-            print(f'on_disconnect | '
-                  f'client: {client} | '
-                  f'userdata: {userdata} | '
-                  f'rc: {rc}')
+        log.debug('on_disconnect | client: %s | userdata: %s | rc: %s',
+                  client, userdata, rc)
         
     def _on_log(self, client, userdata, level, buf):
         """Callback on log"""
-        if self.debug:
-            print(f'on_log | '
-                  f'client: {client} | '
-                  f'userdata: {userdata} | '
-                  f'level: {level} | '
-                  f'buf: {buf}')
+        log.debug('on_log | client: %s | userdata: %s | level: %s | buf: %s',
+                  client, userdata, level, buf)
 
 class MosquittoPublisher(MosquittoClient):
     """Mosquitto MQTT Publisher"""
@@ -116,8 +109,9 @@ class MosquittoPublisher(MosquittoClient):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
-        # Set callbacks
-        self.client.on_publish = self._on_publish
+        # Set callbacks (debug output only)
+        if self.debug:
+            self.client.on_publish = self._on_publish
     
     def publish(self, topic: str, payload: bin, qos=0, retain=False, properties=None):
         """Publish to topic"""
@@ -130,31 +124,59 @@ class MosquittoPublisher(MosquittoClient):
                                         qos=int(qos),
                                         retain=bool(retain),
                                         properties=properties)
-        if self.debug:
-            print(f'publish | '
-                  f'return: rc {rc} | '
-                  f'mid: {mid}')
+        log.debug('publish | return: rc %s | mid: %s',
+                  rc, mid)
         return (rc, mid)
 
+    def publish_bytes(self, topic: str, payload: bytes, qos=0, retain=False):
+        """Publish bytes payload to topic (fast path, no conversion)"""
+        """
+        * Payload is passed through to paho as is (no str to bytes encoding).
+        * Do not reuse bytearray payload, paho keeps reference until sent.
+        """
+        return tuple(self.client.publish(topic, payload, qos, retain))
+
+    def publish_many(self, items):
+        """Publish multiple messages [(topic, payload, qos, retain), ...]"""
+        """
+        * Messages are queued back to back without per message overhead.
+        * Running network loop drains queued messages together.
+        """
+
+        # Queue all messages with bound method
+        publish = self.client.publish
+        results = []
+        results_append = results.append
+        for topic, payload, qos, retain in items:
+            (rc, mid) = publish(topic, payload, int(qos), bool(retain))
+            results_append((rc, mid))
+        log.debug('publish_many | count: %s',
+                  len(results))
+        return results
+
     def _on_publish(self, client, userdata, mid):
         """Callback on publish"""
-        if self.debug:
-            print(f'on_publish | '
-                  f'client: {client} | '
-                  f'userdata: {userdata} | '
-                  f'mid: {mid}')
+        log.debug('on_publish | client: %s | userdata: %s | mid: %s',
+                  client, userdata, mid)
 
 class MosquittoSubscriber(MosquittoClient):
     """Mosquitto MQTT Subscriber"""
     
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, full_message=False, receive_qt=100000, **kwargs):
         super().__init__(*args, **kwargs)
-        self.message_queue = deque()
         
-        # Set callbacks
-        self.client.on_subscribe = self._on_subscribe
-        self.client.on_unsubscribe = self._on_unsubscribe
-        self.client.on_message = self._on_message
+        # Create received message queue, oldest dropped when full (0 for unbounded)
+        self.message_queue = deque(maxlen=receive_qt or None)
+        self.dropped_count = 0
+        
+        # Set callbacks (full paho message kept only if requested, e.g. for debug)
+        if self.debug:
+            self.client.on_subscribe = self._on_subscribe
+            self.client.on_unsubscribe = self._on_unsubscribe
+        if full_message:
+            self.client.on_message = self._on_message_full
+        else:
+            self.client.on_message = self._on_message
     
     def subscribe(self, topic, qos=0, options=None, properties=None):
         """Subscribe topic"""
@@ -166,10 +188,8 @@ class MosquittoSubscriber(MosquittoClient):
                                           qos=int(qos),
                                           options=options,
                                           properties=properties)
-        if self.debug:
-            print(f'subscribe | '
-                  f'return: rc {rc} | '
-                  f'mid: {mid}')
+        log.debug('subscribe | return: rc %s | mid: %s',
+                  rc, mid)
         return (rc, mid)
     
     def unsubscribe(self, topic, properties=None):
@@ -177,12 +197,19 @@ class MosquittoSubscriber(MosquittoClient):
         (rc, mid) = self.client.unsubscribe(topic=topic,
                                             properties=properties)
         self.message_queue.clear()
-        if self.debug:
-            print(f'unsubscribe | '
-                  f'return: rc {self.rc} | '
-                  f'mid: {self.mid}')
+        log.debug('unsubscribe | return: rc %s | mid: %s',
+                  rc, mid)
         return (rc, mid)
     
+    def drain(self):
+        """Pop all received messages as list"""
+        """
+        * Safe while looping on background (no copy and clear race).
+        """
+        message_queue = self.message_queue
+        popleft = message_queue.popleft
+        return [popleft() for _ in range(len(message_queue))]
+    
     def disconnect(self):
         """Disconnect client"""
         super().disconnect()
@@ -213,33 +240,120 @@ class MosquittoSubscriber(MosquittoClient):
     
     def _on_subscribe(self, client, userdata, mid, granted_qos):
         """Callback on subscribe"""
-        if self.debug:
-            print(f'on_subscribe | '
-                  f'client: {client} | '
-                  f'userdata: {userdata} | '
-                  f'mid: {mid} | '
-                  f'granted_qos: {granted_qos}')
+        log.debug('on_subscribe | client: %s | userdata: %s | mid: %s | granted_qos: %s',
+                  client, userdata, mid, granted_qos)
         
     def _on_unsubscribe(self, client, userdata, mid):
         """Callback on unsubscribe"""
-        if self.debug:
-            print(f'on_unsubscribe | '
-                  f'client: {client} | '
-                  f'userdata: {userdata} | '
-                  f'mid: {mid}')
+        log.debug('on_unsubscribe | client: %s | userdata: %s | mid: %s',
+                  client, userdata, mid)
         
     def _on_message(self, client, userdata, message):
         """Callback on message reception"""
-        self.message_queue.append(message)
-        if self.debug:
-            print(f'on_message | '
-                  f'client: {client} | '
-                  f'userdata: {userdata} | '
-                  f'message: {message} | '
-                  f'topic: {message.topic} | '
-                  f'payload: {message.payload} | '
-                  f'qos: {message.qos} | '
-                  f'retain: {message.retain}')
+        """
+        * Queue topic (decoded once, interned) and raw payload (not decoded).
+        """
+        message_queue = self.message_queue
+        if len(message_queue) == message_queue.maxlen:
+            self.dropped_count += 1
+        message_queue.append(MosquittoMessage(intern(message.topic),
+                                              message.payload))
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('on_message | client: %s | userdata: %s | message: %s | topic: %s | payload: %s | qos: %s | retain: %s',
+                      client, userdata, message, message.topic,
+                      message.payload, message.qos, message.retain)
+    
+    def _on_message_full(self, client, userdata, message):
+        """Callback on message reception, queueing full paho message"""
+        message_queue = self.message_queue
+        if len(message_queue) == message_queue.maxlen:
+            self.dropped_count += 1
+        message_queue.append(message)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('on_message | client: %s | userdata: %s | message: %s | topic: %s | payload: %s | qos: %s | retain: %s',
+                      client, userdata, message, message.topic,
+                      message.payload, message.qos, message.retain)
+
+class ShardedSubscriber:
+    """Mosquitto MQTT Subscriber sharded over multiple clients"""
+    """
+    * Each client has its own socket and loop thread on background.
+    * Topics are subscribed as shared subscription "$share/<group>/<topic>",
+      so broker distributes messages over clients.
+    * All clients append to one shared message queue.
+    """
+    
+    def __init__(self, id, host, count=4, group='nodi', receive_qt=100000, **kwargs):
+        self.group = group
+        
+        # Create subscribers with own client IDs
+        self.subscribers = [MosquittoSubscriber(f'{id}-{n}', host, receive_qt=receive_qt, **kwargs)
+                            for n in range(count)]
+        
+        # Share one message queue (deque append/popleft are thread safe)
+        self.message_queue = self.subscribers[0].message_queue
+        for subscriber in self.subscribers:
+            subscriber.message_queue = self.message_queue
+    
+    @property
+    def dropped_count(self):
+        return sum(subscriber.dropped_count for subscriber in self.subscribers)
+    
+    def connect(self):
+        """Connect clients"""
+        for subscriber in self.subscribers:
+            subscriber.connect()
+    
+    def disconnect(self):
+        """Disconnect clients"""
+        for subscriber in self.subscribers:
+            subscriber.disconnect()
+    
+    def check_connection(self):
+        """Check connection status of all clients"""
+        return all(subscriber.check_connection() for subscriber in self.subscribers)
+    
+    def subscribe(self, topic, qos=0, options=None, properties=None):
+        """Subscribe topic as shared subscription on each client"""
+        """
+        * Should delivery topic or list [(topic, qos), ...] as argument.
+        """
+        if isinstance(topic, str):
+            topic = self._share(topic)
+        else:
+            topic = [(self._share(topic_name), topic_qos) for topic_name, topic_qos in topic]
+        return [subscriber.subscribe(topic, qos, options, properties)
+                for subscriber in self.subscribers]
+    
+    def unsubscribe(self, topic, properties=None):
+        """Unsubscribe shared subscription on each client"""
+        if isinstance(topic, str):
+            topic = self._share(topic)
+        else:
+            topic = [self._share(topic_name) for topic_name in topic]
+        return [subscriber.unsubscribe(topic, properties)
+                for subscriber in self.subscribers]
+    
+    def drain(self):
+        """Pop all received messages of all clients as list"""
+        return self.subscribers[0].drain()
+    
+    def start_loop_back(self):
+        """Start looping of each client on background"""
+        for subscriber in self.subscribers:
+            subscriber.start_loop_back()
+    
+    def stop_loop_back(self):
+        """Stop looping of each client on background"""
+        for subscriber in self.subscribers:
+            subscriber.stop_loop_back()
+    
+    def check_loop_back(self):
+        """Check looping status of all clients on background"""
+        return all(subscriber.check_loop_back() for subscriber in self.subscribers)
+    
+    def _share(self, topic):
+        return f'$share/{self.group}/{topic}'
 
 if __name__ == '__main__':
     
@@ -297,12 +411,9 @@ if __name__ == '__main__':
                 while True:
                     print('CHECK!!!!', mqs.check_loop_back())
                     msg_ls = []
-                    if len(mqs.message_queue) > 0:
-                        msg_qu_cp = mqs.message_queue.copy()
-                        mqs.message_queue.clear()
-                        for msg_it in msg_qu_cp:
-                            msg_ls.append([msg_it.topic,
-                                           msg_it.payload.decode()])
+                    for msg_it in mqs.drain():
+                        msg_ls.append([msg_it.topic,
+                                       msg_it.payload.decode()])
                     print(msg_ls)
                     cnt += 1
                     print(f"MQS IS RUNNING! {cnt}")
@@ -9,7 +9,7 @@ from pkg.command_tool import shell_command
         
 def test_ping(address: str, count: int = 1, timeout: float = 1.0) -> bool:
     try:
-        command = f'ping {address} -c {count} -W {timeout}'
+        command = ['ping', address, '-c', str(count), '-W', str(timeout)]
         result = shell_command(command)
         if '1 received' in result.stdout:
             return True
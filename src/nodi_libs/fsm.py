@@ -68,7 +68,8 @@ class FiniteStateMachine:
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
     def _machine_loop(self):
-        while not self._stop_event.is_set():
+        is_stopped = self._stop_event.is_set
+        while not is_stopped():
             handler = self._handler
             if handler is None:
                 break
@@ -168,7 +169,7 @@ class FiniteStateMachine:
 
         # Update state
         self._state = next_state
-        self._handler = self._states.get(next_state, self._missing_handler)
+        self._handler = self._states[next_state]
         self._state_entry_time = time()
         self._transition_count += 1
 
@@ -252,6 +253,3 @@ class FiniteStateMachine:
             return True
         allowed = self._allowed_transitions.get(self._state)
         return allowed is None or next_state in allowed
-
-    def _missing_handler(self):
-        raise ValueError(f"No handler defined for state: {self._state}")
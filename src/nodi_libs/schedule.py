@@ -86,9 +86,13 @@ class CronSchedule:
                  cron_expression: str = '* * * * * *',
                  base_time: Optional[datetime] = None,
                  return_type: Type = datetime):
-        self._cron_expression = cron_expression
+        self._fields = self._parse_fields(cron_expression)
+        self._has_now = 'N' in cron_expression
         self._return_type = return_type
         self._base_time: datetime = base_time or datetime.now()
+        self._cron: Optional[croniter] = None
+        self._cron_expression: Optional[str] = None
+        self._cron_base_time: Optional[datetime] = None
 
 
     # Properties
@@ -106,50 +110,66 @@ class CronSchedule:
         self._base_time = base_time or datetime.now()
 
     def get_next(self, count: int = 1) -> List[Union[datetime, float]]:
-        cron = self._build_croniter()
+        cron = self._get_croniter()
         results = []
         for _ in range(count):
             results.append(cron.get_next())
-        self._base_time = cron.get_current(datetime)
+        self._base_time = self._cron_base_time = cron.get_current(datetime)
         return results
 
     def get_prev(self, count: int = 1) -> List[Union[datetime, float]]:
-        cron = self._build_croniter()
+        cron = self._get_croniter()
         results = []
         for _ in range(count):
             results.append(cron.get_prev())
-        self._base_time = cron.get_current(datetime)
+        self._base_time = self._cron_base_time = cron.get_current(datetime)
         return results
 
 
     # Private Methods
     # ──────────────────────────────────────────────────────────────────────
 
-    def _build_croniter(self) -> croniter:
-        fields = self._cron_expression.split()
+    def _parse_fields(self, cron_expression: str) -> List[str]:
+        fields = cron_expression.split()
         if len(fields) != self._FIELD_COUNT:
             raise ValueError(
                 f"expected {self._FIELD_COUNT} fields "
                 f"(month date weekday hour minute second), got {len(fields)}"
             )
-        month, date, weekday, hour, minute, second = fields
+        return fields
+
+    def _get_croniter(self) -> croniter:
+        expression = self._build_expression()
+
+        # Reuse croniter (and its parsed fields) while it is still positioned at base_time
+        if (self._cron is not None
+                and expression == self._cron_expression
+                and self._base_time == self._cron_base_time):
+            return self._cron
+
+        self._cron = croniter(expr_format=expression,
+                              start_time=self._base_time,
+                              ret_type=self._return_type)
+        self._cron_expression = expression
+        self._cron_base_time = self._base_time
+        return self._cron
+
+    def _build_expression(self) -> str:
+        month, date, weekday, hour, minute, second = self._fields
 
         # Replace N symbol with base_time field values
-        month = month.replace('N', str(self._base_time.month))
-        date = date.replace('N', str(self._base_time.day))
-        weekday = weekday.replace('N', str(self._base_time.weekday()))
-        hour = hour.replace('N', str(self._base_time.hour))
-        minute = minute.replace('N', str(self._base_time.minute))
-        second = second.replace('N', str(self._base_time.second))
+        if self._has_now:
+            month = month.replace('N', str(self._base_time.month))
+            date = date.replace('N', str(self._base_time.day))
+            weekday = weekday.replace('N', str(self._base_time.weekday()))
+            hour = hour.replace('N', str(self._base_time.hour))
+            minute = minute.replace('N', str(self._base_time.minute))
+            second = second.replace('N', str(self._base_time.second))
 
         # Convert nodi field order → croniter field order
         # nodi:     month date weekday hour minute second
         # croniter: minute hour date month weekday second
-        croniter_expression = f"{minute} {hour} {date} {month} {weekday} {second}"
-
-        return croniter(expr_format=croniter_expression,
-                        start_time=self._base_time,
-                        ret_type=self._return_type)
+        return f"{minute} {hour} {date} {month} {weekday} {second}"
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━